@@ -43,6 +43,46 @@ def test_mode_for_config():
         os.environ[ENV_WHAI_TEST_MODE] = original
 
 
+@pytest.fixture(autouse=True)
+def reset_session_approvals():
+    """Forget commands and tool calls approved for the session by earlier tests."""
+    from whai.interaction.approval import _SESSION_APPROVALS
+
+    _SESSION_APPROVALS.clear()
+    yield
+    _SESSION_APPROVALS.clear()
+
+
+@pytest.fixture(autouse=True)
+def line_input_for_approvals(monkeypatch):
+    """
+    Answer approval prompts through input() even when pytest runs on a terminal.
+
+    Approval reads a raw keypress when stdin is a TTY; tests patch input(), so
+    single-key reading is made unavailable unless a test stubs it itself.
+    """
+
+    def _no_single_key() -> str:
+        raise OSError("single-key input disabled in tests")
+
+    monkeypatch.setattr("whai.interaction.approval._read_key", _no_single_key)
+
+
+@pytest.fixture(autouse=True)
+def reset_detected_shell():
+    """Clear cached shell and PATH lookups so tests can vary the environment."""
+    from whai.interaction.execution import _shell_argv_prefix, _which
+    from whai.utils import detect_shell
+
+    detect_shell.cache_clear()
+    _shell_argv_prefix.cache_clear()
+    _which.cache_clear()
+    yield
+    detect_shell.cache_clear()
+    _shell_argv_prefix.cache_clear()
+    _which.cache_clear()
+
+
 def pytest_configure(config):
     """Configure pytest-anyio to only use asyncio backend."""
     os.environ.setdefault("ANYIO_BACKEND", "asyncio")
@@ -6,6 +6,8 @@ and provides clear, actionable error messages to users.
 
 import json
 import subprocess
+import sys
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -199,3 +201,125 @@ def test_timeout_does_not_leak_subprocess():
     final_children = len(psutil.Process(os.getpid()).children(recursive=True))
     assert final_children <= initial_children + 1, "Should not leak subprocess"
 
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX process groups")
+def test_command_timeout_kills_child_processes(tmp_path):
+    """Test that a timeout also kills processes spawned by the command."""
+    marker = tmp_path / "child_survived"
+    with pytest.raises(RuntimeError, match="timed out"):
+        execute_command(f"(sleep 1; touch '{marker}') & wait", timeout=0.3)
+
+    # The background child would create the marker if it outlived the timeout
+    time.sleep(1.5)
+    assert not marker.exists()
+
+
+def _run_whai_script(body):
+    """Build a child interpreter command running ``body`` with execute_command imported."""
+    script = "from whai.interaction import execute_command\n" + body
+    return [sys.executable, "-c", script]
+
+
+def _run_in_terminal(argv, keys=b"", keys_after=None, timeout=15):
+    """
+    Run ``argv`` with a pseudo-terminal as its controlling terminal.
+
+    ``keys`` are typed once ``keys_after`` appears in the output (or straight
+    away). Returns everything written to the terminal and the exit status.
+    """
+    import os
+    import pty
+    import select
+
+    pid, master = pty.fork()
+    if pid == 0:  # pragma: no cover - child
+        os.execv(argv[0], argv)
+
+    output = b""
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            if keys and (keys_after is None or keys_after in output):
+                os.write(master, keys)
+                keys = b""
+            ready, _, _ = select.select([master], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                data = os.read(master, 4096)
+            except OSError:  # EIO once the child side is closed
+                break
+            if not data:
+                break
+            output += data
+        else:
+            os.kill(pid, 9)
+            pytest.fail(f"terminal session hung: {output!r}")
+    finally:
+        os.close(master)
+    _, status = os.waitpid(pid, 0)
+    return output.decode("utf-8", "replace"), os.waitstatus_to_exitcode(status)
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX terminals")
+def test_command_can_read_controlling_terminal():
+    """Test that commands can still prompt on /dev/tty (sudo, ssh, git credentials)."""
+    argv = _run_whai_script(
+        "out, err, rc = execute_command("
+        "'read answer < /dev/tty && echo \"got:$answer\"', timeout=10)\n"
+        "print(repr((out, err, rc)))\n"
+    )
+    output, status = _run_in_terminal(argv, keys=b"secret\n")
+
+    assert status == 0, output
+    assert "('got:secret\\n', '', 0)" in output
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX terminals")
+def test_terminal_ctrl_c_stops_command_and_interrupts_whai(tmp_path):
+    """Test that Ctrl-C typed at the terminal stops the command and reaches whai."""
+    marker = tmp_path / "command_survived"
+    argv = _run_whai_script(
+        "try:\n"
+        "    execute_command(\n"
+        f"        \"echo ready > /dev/tty; sleep 1; touch '{marker}'\", timeout=10\n"
+        "    )\n"
+        "except KeyboardInterrupt:\n"
+        "    print('interrupted')\n"
+    )
+    # Type Ctrl-C once the command is running and holds the terminal
+    output, status = _run_in_terminal(argv, keys=b"\x03", keys_after=b"ready")
+
+    assert status == 0, output
+    assert "interrupted" in output
+    time.sleep(1.5)
+    assert not marker.exists()
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="POSIX process groups")
+def test_keyboard_interrupt_kills_command(tmp_path):
+    """Test that Ctrl-C while waiting kills the command instead of leaving it running."""
+    import signal
+
+    marker = tmp_path / "command_survived"
+    # SIGINT sent to whai alone, as when it doesn't own the terminal's foreground
+    child = subprocess.Popen(
+        _run_whai_script(
+            "print('started', flush=True)\n"
+            f"execute_command(\"sleep 1; touch '{marker}'\", timeout=10)\n"
+        ),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        assert child.stdout.readline() == b"started\n"
+        time.sleep(0.3)
+        child.send_signal(signal.SIGINT)
+        _, stderr = child.communicate(timeout=10)
+    finally:
+        child.kill()
+
+    assert b"KeyboardInterrupt" in stderr
+    time.sleep(1.5)
+    assert not marker.exists()
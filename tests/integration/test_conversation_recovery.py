@@ -257,3 +257,102 @@ def test_mcp_config_error_does_not_raise_systemexit():
         )
     except SystemExit as exc:  # pragma: no cover
         pytest.fail(f"run_conversation_loop should not call sys.exit, got {exc}")
+
+
+def test_command_output_mentioning_rejected_does_not_end_conversation():
+    mock_provider = MagicMock(spec=LLMProvider)
+
+    responses = [
+        _stream(
+            [
+                {
+                    "type": "tool_call",
+                    "id": "shell_1",
+                    "name": "execute_shell",
+                    "arguments": {"command": "grep rejected app.log"},
+                },
+            ]
+        ),
+        _stream(
+            [
+                {
+                    "type": "tool_call",
+                    "id": "done_1",
+                    "name": "task_complete",
+                    "arguments": {},
+                },
+            ]
+        ),
+    ]
+
+    mock_provider.send_message.side_effect = lambda *args, **kwargs: responses.pop(0)
+
+    with (
+        patch("whai.core.executor.approval_loop", side_effect=lambda cmd: cmd),
+        patch(
+            "whai.core.executor.execute_command",
+            return_value=("request rejected by upstream\n", "", 0),
+        ),
+    ):
+        run_conversation_loop(
+            mock_provider,
+            [
+                {"role": "system", "content": "You are helpful."},
+                {"role": "user", "content": "Why are requests failing?"},
+            ],
+            timeout=30,
+        )
+
+    assert mock_provider.send_message.call_count == 2
+
+
+def test_repeated_identical_command_output_is_sent_as_reference():
+    mock_provider = MagicMock(spec=LLMProvider)
+    messages = [
+        {"role": "system", "content": "You are helpful."},
+        {"role": "user", "content": "Watch the log."},
+    ]
+
+    def _shell_call(call_id):
+        return _stream(
+            [
+                {
+                    "type": "tool_call",
+                    "id": call_id,
+                    "name": "execute_shell",
+                    "arguments": {"command": "cat app.log"},
+                },
+            ]
+        )
+
+    responses = [
+        _shell_call("shell_1"),
+        _shell_call("shell_2"),
+        _stream(
+            [
+                {
+                    "type": "tool_call",
+                    "id": "done_1",
+                    "name": "task_complete",
+                    "arguments": {},
+                },
+            ]
+        ),
+    ]
+
+    mock_provider.send_message.side_effect = lambda *args, **kwargs: responses.pop(0)
+    log_output = "line of log output\n" * 50
+
+    with (
+        patch("whai.core.executor.approval_loop", side_effect=lambda cmd: cmd),
+        patch(
+            "whai.core.executor.execute_command", return_value=(log_output, "", 0)
+        ),
+    ):
+        run_conversation_loop(mock_provider, messages, timeout=30)
+
+    tool_messages = [m for m in messages if m["role"] == "tool"]
+    assert len(tool_messages) == 2
+    assert log_output in tool_messages[0]["content"]
+    assert log_output not in tool_messages[1]["content"]
+    assert "identical to earlier tool result shell_1" in tool_messages[1]["content"]
@@ -4,6 +4,7 @@ These tests validate that whai handles errors gracefully and shows
 helpful messages to users rather than crashing.
 """
 
+import io
 import subprocess
 from unittest.mock import MagicMock, patch
 
@@ -110,14 +111,15 @@ def test_very_large_command_output_truncated():
     large_output = "A" * 500_000
     
     with (
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
         patch("whai.interaction.execution.is_windows", return_value=False),
     ):
-        mock_result = MagicMock()
-        mock_result.stdout = large_output
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        mock_process = MagicMock()
+        mock_process.stdout = io.BytesIO(large_output.encode())
+        mock_process.stderr = io.BytesIO(b"")
+        mock_process.wait.return_value = 0
+        mock_process.returncode = 0
+        mock_popen.return_value = mock_process
         
         # Should not crash
         stdout, stderr, code = execute_command("echo test")
@@ -188,6 +188,7 @@ def test_streaming_handles_empty_chunks_gracefully(test_messages):
         MagicMock(choices=[MagicMock(delta=MagicMock(content="Start ", tool_calls=None))]),
         MagicMock(choices=[MagicMock(delta=MagicMock(content=None, tool_calls=None))]),  # Empty
         MagicMock(choices=[MagicMock(delta=MagicMock(content="", tool_calls=None))]),  # Empty string
+        MagicMock(choices=[]),  # Keepalive/usage frame with no choices
         MagicMock(choices=[MagicMock(delta=MagicMock(content="End", tool_calls=None))]),
     ]
     
@@ -345,3 +346,168 @@ def test_streaming_extracts_tool_calls_with_empty_arguments(test_messages):
     assert stream_tool_calls[0]["name"] == "mcp_some-server_no_args_tool"
     assert stream_tool_calls[0]["arguments"] == {}
 
+
+def test_streaming_tool_call_preserves_raw_arguments(test_messages):
+    """Test that streamed tool calls keep the provider's raw JSON argument string."""
+    config = create_test_config(
+        default_provider="openai",
+        default_model="gpt-4",
+        api_key="test-key",
+    )
+
+    first = MagicMock()
+    first.id = "call_raw_123"
+    first.function = MagicMock()
+    first.function.name = "execute_shell"
+    first.function.arguments = '{"command": '
+
+    second = MagicMock()
+    second.id = None
+    second.function = MagicMock()
+    second.function.name = None
+    second.function.arguments = '"ls -la"}'
+
+    mock_chunks = [
+        MagicMock(choices=[MagicMock(delta=MagicMock(content=None, tool_calls=[first]))]),
+        MagicMock(choices=[MagicMock(delta=MagicMock(content=None, tool_calls=[second]))]),
+    ]
+
+    provider = LLMProvider(config, perf_logger=create_test_perf_logger())
+
+    with patch("litellm.completion", return_value=iter(mock_chunks)):
+        result_stream = list(provider.send_message(test_messages, stream=True, tools=[]))
+
+    stream_tool_calls = [chunk for chunk in result_stream if chunk.get("type") == "tool_call"]
+
+    assert len(stream_tool_calls) == 1
+    assert stream_tool_calls[0]["arguments"] == {"command": "ls -la"}
+    assert stream_tool_calls[0]["arguments_raw"] == '{"command": "ls -la"}'
+
+
+def test_streaming_coalesces_rapid_text_deltas(test_messages):
+    """Test that token-sized deltas arriving back-to-back are batched without loss."""
+    config = create_test_config(
+        default_provider="openai",
+        default_model="gpt-4",
+        api_key="test-key",
+    )
+
+    tokens = [f"tok{i} " for i in range(50)]
+    mock_chunks = [
+        MagicMock(choices=[MagicMock(delta=MagicMock(content=token, tool_calls=None))])
+        for token in tokens
+    ]
+
+    provider = LLMProvider(config, perf_logger=create_test_perf_logger())
+
+    with patch("litellm.completion", return_value=iter(mock_chunks)):
+        result_stream = list(provider.send_message(test_messages, stream=True, tools=[]))
+
+    # The first delta is shown immediately; the rest arrive in fewer, larger chunks
+    assert result_stream[0]["content"] == tokens[0]
+    assert len(result_stream) < len(tokens)
+    assert "".join(chunk["content"] for chunk in result_stream) == "".join(tokens)
+
+
+def test_streaming_tool_call_split_per_character_parses_once(test_messages):
+    """Test that arguments streamed char-by-char (braces/escapes in strings) parse once at the end."""
+    import json
+
+    config = create_test_config(
+        default_provider="openai",
+        default_model="gpt-4",
+        api_key="test-key",
+    )
+
+    arguments = json.dumps({"command": 'echo "}{" | awk \'{print $1}\' \\\\'})
+    deltas = []
+    for i, char in enumerate(arguments):
+        tool = MagicMock()
+        tool.id = "call_chars" if i == 0 else None
+        tool.function = MagicMock()
+        tool.function.name = "execute_shell" if i == 0 else None
+        tool.function.arguments = char
+        deltas.append(
+            MagicMock(choices=[MagicMock(delta=MagicMock(content=None, tool_calls=[tool]))])
+        )
+
+    provider = LLMProvider(config, perf_logger=create_test_perf_logger())
+
+    with (
+        patch("litellm.completion", return_value=iter(deltas)),
+        patch("whai.llm.streaming.json.loads", wraps=json.loads) as mock_loads,
+    ):
+        result_stream = list(provider.send_message(test_messages, stream=True, tools=[]))
+
+    stream_tool_calls = [chunk for chunk in result_stream if chunk.get("type") == "tool_call"]
+    assert len(stream_tool_calls) == 1
+    assert stream_tool_calls[0]["arguments"] == json.loads(arguments)
+    assert mock_loads.call_count == 1
+
+
+def test_streaming_flushes_text_when_tool_call_starts(test_messages):
+    """Test that text preceding a tool call is shown before its arguments finish streaming."""
+    config = create_test_config(
+        default_provider="openai",
+        default_model="gpt-4",
+        api_key="test-key",
+    )
+
+    def tool_delta(call_id, name, arguments):
+        tool = MagicMock()
+        tool.id = call_id
+        tool.function = MagicMock()
+        tool.function.name = name
+        tool.function.arguments = arguments
+        return MagicMock(choices=[MagicMock(delta=MagicMock(content=None, tool_calls=[tool]))])
+
+    consumed = []
+
+    def stream():
+        deltas = [
+            MagicMock(choices=[MagicMock(delta=MagicMock(content="Run", tool_calls=None))]),
+            MagicMock(choices=[MagicMock(delta=MagicMock(content=" this:", tool_calls=None))]),
+            tool_delta("call_1", "execute_shell", '{"command": '),
+            tool_delta(None, None, '"ls"}'),
+        ]
+        for i, delta in enumerate(deltas):
+            consumed.append(i)
+            yield delta
+
+    provider = LLMProvider(config, perf_logger=create_test_perf_logger())
+
+    with patch("litellm.completion", return_value=stream()):
+        result_stream = provider.send_message(test_messages, stream=True)
+        text = ""
+        while "this:" not in text:
+            text += next(result_stream)["content"]
+        # The closing argument delta hasn't been read yet
+        assert consumed == [0, 1, 2]
+        rest = list(result_stream)
+
+    assert text == "Run this:"
+    assert [chunk["type"] for chunk in rest] == ["tool_call"]
+
+
+def test_streaming_flushes_buffered_text_when_stream_fails(test_messages):
+    """Test that buffered text is still delivered when the stream raises partway."""
+    config = create_test_config(
+        default_provider="openai",
+        default_model="gpt-4",
+        api_key="test-key",
+    )
+
+    def stream():
+        yield MagicMock(choices=[MagicMock(delta=MagicMock(content="Hello", tool_calls=None))])
+        yield MagicMock(choices=[MagicMock(delta=MagicMock(content=" world", tool_calls=None))])
+        raise ConnectionError("stream dropped")
+
+    provider = LLMProvider(config, perf_logger=create_test_perf_logger())
+
+    received = []
+    with patch("litellm.completion", return_value=stream()):
+        with pytest.raises(ConnectionError):
+            for chunk in provider.send_message(test_messages, stream=True):
+                received.append(chunk["content"])
+
+    assert "".join(received) == "Hello world"
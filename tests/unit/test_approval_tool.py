@@ -82,3 +82,13 @@ class TestApproveTool:
             )
             assert result is True
 
+    def test_approve_tool_session_approval_matches_exact_args(self):
+        """Test session approval skips the prompt only for identical arguments."""
+        with patch("builtins.input", return_value="s") as mock_input:
+            assert approve_tool("mcp_fs_read_file", {"path": "a.txt", "n": 1}) is True
+            # Same arguments in a different order are the same call
+            assert approve_tool("mcp_fs_read_file", {"n": 1, "path": "a.txt"}) is True
+            assert mock_input.call_count == 1
+
+        with patch("builtins.input", return_value="r"):
+            assert approve_tool("mcp_fs_read_file", {"path": "b.txt", "n": 1}) is False
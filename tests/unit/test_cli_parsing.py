@@ -663,6 +663,24 @@ def test_target_from_env_when_no_cli_flag(monkeypatch, mock_llm_capture_messages
         assert len(captured_calls) > 0
 
 
+def test_initial_messages_alternate_roles(mock_llm_capture_messages):
+    """Test: the context note opens the user message instead of a second system message."""
+    mock_completion, captured_calls = mock_llm_capture_messages
+
+    with (
+        patch("litellm.completion", side_effect=mock_completion),
+        patch("whai.context.get_context", return_value=("", False)),
+    ):
+        result = runner.invoke(app, ["--no-context", "test", "query"])
+
+        assert result.exit_code == 0
+        messages = captured_calls[0]["messages"]
+        assert [m["role"] for m in messages] == ["system", "user"]
+        assert "CWD:" not in messages[0]["content"]
+        assert messages[1]["content"].startswith("CONTEXT:\n")
+        assert messages[1]["content"].endswith("test query")
+
+
 def test_no_mcp_flag_skips_mcp_init(mock_llm_capture_messages):
     """Test: whai --no-mcp test query — MCP manager should not be initialized."""
     mock_completion, captured_calls = mock_llm_capture_messages
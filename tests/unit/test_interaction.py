@@ -1,5 +1,7 @@
 """Tests for interaction module."""
 
+import io
+import signal
 import subprocess
 from unittest.mock import MagicMock, patch
 
@@ -8,26 +10,129 @@ import pytest
 from whai import interaction
 
 
+def _mock_process(stdout="", stderr="", returncode=0):
+    """Build a fake Popen object whose pipes yield the given output."""
+    process = MagicMock()
+    process.stdout = io.BytesIO(stdout.encode("utf-8"))
+    process.stderr = io.BytesIO(stderr.encode("utf-8"))
+    process.wait.return_value = returncode
+    process.returncode = returncode
+    process.pid = 4242
+    return process
+
+
+@pytest.fixture(autouse=True)
+def no_terminal_handoff(monkeypatch):
+    """Keep mocked commands from taking the real terminal when run from one."""
+    monkeypatch.setattr(
+        "whai.interaction.execution._foreground_terminal", lambda: None
+    )
+
+
 def test_execute_command_unix_success():
     """Test successful command execution on Unix."""
     with (
         patch("whai.interaction.execution.is_windows", return_value=False),
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
         patch.dict("os.environ", {"SHELL": "/bin/bash"}),
     ):
-        mock_result = MagicMock()
-        mock_result.stdout = "file1.txt\nfile2.txt\n"
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process("file1.txt\nfile2.txt\n")
 
-        stdout, stderr, code = interaction.execute_command("ls")
+        stdout, stderr, code = interaction.execute_command("ls *.txt")
 
         assert "file1.txt" in stdout
         assert "file2.txt" in stdout
         assert stderr == ""
         assert code == 0
-        mock_run.assert_called_once()
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args[0][0] == ["/bin/bash", "-c", "ls *.txt"]
+        # Own process group, but the same session so /dev/tty stays reachable
+        assert "start_new_session" not in mock_popen.call_args[1]
+        for key, value in interaction.execution._new_process_group_kwargs().items():
+            assert mock_popen.call_args[1][key] == value
+
+
+@pytest.mark.parametrize(
+    "command, expected_argv",
+    [
+        ("ls -la /tmp", ["ls", "-la", "/tmp"]),
+        ("git log --oneline", None),  # not on PATH in this test
+        ("ls | wc -l", None),
+        ("echo $HOME", None),
+        ("cat 'my file.txt'", None),
+        ("cd /tmp", None),
+        # Builtins and keywords that also exist on PATH behave differently there
+        ("pwd", None),
+        ("time make", None),
+        ("echo -n hi", None),
+        ("kill 1234", None),
+        ("type ls", None),
+        ("FOO=1 make", None),
+    ],
+)
+def test_execute_command_skips_shell_for_simple_commands(
+    command, expected_argv, monkeypatch
+):
+    """Plain program invocations run directly; anything needing the shell does not."""
+    monkeypatch.delenv("BASH_ENV", raising=False)
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=False),
+        patch(
+            "whai.interaction.execution.shutil.which",
+            side_effect=lambda name: None if name == "git" else f"/bin/{name}",
+        ),
+        patch("subprocess.Popen") as mock_popen,
+        patch.dict("os.environ", {"SHELL": "/bin/bash"}),
+    ):
+        mock_popen.return_value = _mock_process()
+
+        interaction.execute_command(command)
+
+        assert mock_popen.call_args[0][0] == (
+            expected_argv or ["/bin/bash", "-c", command]
+        )
+
+
+@pytest.mark.parametrize(
+    "env",
+    [
+        {"SHELL": "/usr/bin/zsh"},  # reads .zshenv for -c
+        {"SHELL": "/usr/bin/fish"},
+        {"SHELL": "/bin/bash", "BASH_ENV": "/home/user/.bashenv"},
+    ],
+)
+def test_execute_command_keeps_shell_that_reads_startup_files(env):
+    """Shells that set up PATH in startup files for -c always run the command."""
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=False),
+        patch("whai.interaction.execution.shutil.which", return_value="/bin/ls"),
+        patch("subprocess.Popen") as mock_popen,
+        patch.dict("os.environ", env),
+    ):
+        mock_popen.return_value = _mock_process()
+
+        interaction.execute_command("ls -la")
+
+        assert mock_popen.call_args[0][0] == [env["SHELL"], "-c", "ls -la"]
+
+
+def test_execute_command_caches_path_lookup(monkeypatch):
+    """The PATH lookup for a program runs once, not on every command."""
+    monkeypatch.delenv("BASH_ENV", raising=False)
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=False),
+        patch(
+            "whai.interaction.execution.shutil.which", return_value="/bin/ls"
+        ) as mock_which,
+        patch("subprocess.Popen") as mock_popen,
+        patch.dict("os.environ", {"SHELL": "/bin/bash"}),
+    ):
+        mock_popen.side_effect = lambda *args, **kwargs: _mock_process()
+
+        interaction.execute_command("ls -la")
+        interaction.execute_command("ls /tmp")
+
+        mock_which.assert_called_once_with("ls")
 
 
 def test_execute_command_windows_powershell():
@@ -35,22 +140,40 @@ def test_execute_command_windows_powershell():
     with (
         patch("whai.interaction.execution.is_windows", return_value=True),
         patch("whai.interaction.execution.detect_shell", return_value="pwsh"),
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
     ):
-        mock_result = MagicMock()
-        mock_result.stdout = "test output\n"
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process("test output\n")
 
         stdout, stderr, code = interaction.execute_command("Get-ChildItem")
 
         assert "test output" in stdout
         assert code == 0
         # Verify PowerShell was used (either pwsh or powershell)
-        call_args = mock_run.call_args[0][0]
+        call_args = mock_popen.call_args[0][0]
         first_arg_lower = call_args[0].lower()
         assert "pwsh" in first_arg_lower or "powershell" in first_arg_lower
+        assert call_args[1:] == [
+            "-NoProfile",
+            "-NonInteractive",
+            "-NoLogo",
+            "-Command",
+            "Get-ChildItem",
+        ]
+
+
+def test_execute_command_windows_powershell_profile_opt_in():
+    """WHAI_POWERSHELL_PROFILE=1 keeps PowerShell's profile loading."""
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=True),
+        patch("whai.interaction.execution.detect_shell", return_value="pwsh"),
+        patch("subprocess.Popen") as mock_popen,
+        patch.dict("os.environ", {"WHAI_POWERSHELL_PROFILE": "1"}),
+    ):
+        mock_popen.return_value = _mock_process()
+
+        interaction.execute_command("Get-ChildItem")
+
+        assert mock_popen.call_args[0][0][1:] == ["-Command", "Get-ChildItem"]
 
 
 def test_execute_command_windows_cmd():
@@ -58,20 +181,16 @@ def test_execute_command_windows_cmd():
     with (
         patch("whai.interaction.execution.is_windows", return_value=True),
         patch("whai.interaction.execution.detect_shell", return_value="bash"),  # Not pwsh
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
     ):
-        mock_result = MagicMock()
-        mock_result.stdout = "test output\n"
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process("test output\n")
 
         stdout, stderr, code = interaction.execute_command("dir")
 
         assert "test output" in stdout
         assert code == 0
         # Verify cmd.exe was used
-        call_args = mock_run.call_args[0][0]
+        call_args = mock_popen.call_args[0][0]
         assert "cmd.exe" in call_args
 
 
@@ -79,14 +198,10 @@ def test_execute_command_with_stderr():
     """Test command execution with stderr output."""
     with (
         patch("whai.interaction.execution.is_windows", return_value=False),
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
         patch.dict("os.environ", {"SHELL": "/bin/bash"}),
     ):
-        mock_result = MagicMock()
-        mock_result.stdout = "output\n"
-        mock_result.stderr = "error message\n"
-        mock_result.returncode = 1
-        mock_run.return_value = mock_result
+        mock_popen.return_value = _mock_process("output\n", "error message\n", 1)
 
         stdout, stderr, code = interaction.execute_command("failing_command")
 
@@ -99,45 +214,73 @@ def test_execute_command_timeout():
     """Test that execute_command raises error on timeout."""
     with (
         patch("whai.interaction.execution.is_windows", return_value=False),
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
+        patch("os.killpg") as mock_killpg,
         patch.dict("os.environ", {"SHELL": "/bin/bash"}),
     ):
-        mock_run.side_effect = subprocess.TimeoutExpired("cmd", 30)
+        process = _mock_process()
+        process.wait.side_effect = [subprocess.TimeoutExpired("cmd", 30), 0]
+        mock_popen.return_value = process
 
         with pytest.raises(RuntimeError, match="timed out"):
             interaction.execute_command("sleep 100", timeout=30)
 
+        # The whole process group is stopped, then force-killed, not just the shell
+        assert [c.args for c in mock_killpg.call_args_list] == [
+            (process.pid, signal.SIGTERM),
+            (process.pid, signal.SIGKILL),
+        ]
+        assert process.wait.call_count == 2
+
+
+def test_force_kill_on_windows_kills_process_tree():
+    """Windows force-kill ends the shell's whole tree, not just the shell."""
+    process = _mock_process()
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=True),
+        patch("subprocess.run") as mock_run,
+    ):
+        mock_run.return_value = MagicMock(returncode=0)
+
+        interaction.execution._signal_process_group(process, force=True)
+
+        assert mock_run.call_args[0][0] == [
+            "taskkill", "/T", "/F", "/PID", str(process.pid)
+        ]
+        process.kill.assert_not_called()
+
+        # Fall back to killing the shell if taskkill can't
+        mock_run.return_value = MagicMock(returncode=128)
+        interaction.execution._signal_process_group(process, force=True)
+        process.kill.assert_called_once()
+
 
 def test_execute_command_infinite_timeout():
     """Test that execute_command with timeout=0 passes None to subprocess (infinite timeout)."""
     with (
         patch("whai.interaction.execution.is_windows", return_value=False),
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
         patch.dict("os.environ", {"SHELL": "/bin/bash"}),
     ):
-        mock_result = MagicMock()
-        mock_result.stdout = "output\n"
-        mock_result.stderr = ""
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
+        process = _mock_process("output\n")
+        mock_popen.return_value = process
 
         stdout, stderr, code = interaction.execute_command("echo test", timeout=0)
 
         assert stdout == "output\n"
         assert code == 0
         # Verify that None was passed as timeout (infinite timeout)
-        call_kwargs = mock_run.call_args[1]
-        assert call_kwargs["timeout"] is None
+        assert process.wait.call_args[1]["timeout"] is None
 
 
 def test_execute_command_other_error():
     """Test that execute_command handles other errors."""
     with (
         patch("whai.interaction.execution.is_windows", return_value=False),
-        patch("subprocess.run") as mock_run,
+        patch("subprocess.Popen") as mock_popen,
         patch.dict("os.environ", {"SHELL": "/bin/bash"}),
     ):
-        mock_run.side_effect = Exception("Something went wrong")
+        mock_popen.side_effect = Exception("Something went wrong")
 
         with pytest.raises(RuntimeError, match="Error executing command"):
             interaction.execute_command("some_command")
@@ -164,6 +307,23 @@ def test_approval_loop_modify():
         assert result == "ls -lh"
 
 
+def test_approval_loop_modify_prefills_original_command():
+    """Test that the modify prompt starts with the original command to edit."""
+    fake_readline = MagicMock()
+    with (
+        patch.dict("sys.modules", {"readline": fake_readline}),
+        patch("builtins.input", side_effect=["m", "ls -lh"]),
+    ):
+        result = interaction.approval_loop("ls -la")
+
+    assert result == "ls -lh"
+    hook = fake_readline.set_startup_hook.call_args_list[0].args[0]
+    hook()
+    fake_readline.insert_text.assert_called_once_with("ls -la")
+    # The hook is removed afterwards so later prompts start empty
+    assert fake_readline.set_startup_hook.call_args_list[-1].args == (None,)
+
+
 def test_approval_loop_invalid_then_approve():
     """Test approval loop with invalid input then approval."""
     with patch("builtins.input", side_effect=["x", "invalid", "a"]):
@@ -178,6 +338,18 @@ def test_approval_loop_modify_empty_retry():
         assert result == "echo test"
 
 
+def test_approval_loop_session_approval_skips_repeat_prompt():
+    """Test that a command approved for the session is not prompted again."""
+    with patch("builtins.input", return_value="s") as mock_input:
+        assert interaction.approval_loop("git status") == "git status"
+        assert interaction.approval_loop("git status") == "git status"
+        assert mock_input.call_count == 1
+
+    # A different command still needs approval
+    with patch("builtins.input", return_value="r"):
+        assert interaction.approval_loop("git status --short") is None
+
+
 def test_approval_loop_keyboard_interrupt():
     """Test approval loop handles keyboard interrupt."""
     with patch("builtins.input", side_effect=KeyboardInterrupt()):
@@ -192,3 +364,62 @@ def test_approval_loop_eof():
         assert result is None
 
 
+def test_approval_loop_single_key_on_tty():
+    """Test that an interactive terminal answers with a single keypress."""
+    with (
+        patch("sys.stdin.isatty", return_value=True),
+        patch("whai.interaction.approval._read_key", return_value="A"),
+        patch("builtins.input") as mock_input,
+    ):
+        result = interaction.approval_loop("ls")
+
+    assert result == "ls"
+    mock_input.assert_not_called()
+
+
+def test_approval_loop_falls_back_to_line_input_without_terminal():
+    """Test that line input is used when single-key reading is unavailable."""
+    with (
+        patch("sys.stdin.isatty", return_value=True),
+        patch("whai.interaction.approval._read_key", side_effect=OSError("no tty")),
+        patch("builtins.input", return_value="r"),
+    ):
+        result = interaction.approval_loop("ls")
+
+    assert result is None
+
+
+def test_execute_command_caps_captured_output(monkeypatch):
+    """Output beyond the capture cap is dropped from the start, keeping the tail."""
+    from whai.interaction import execution
+
+    monkeypatch.setattr(execution, "MAX_CAPTURED_OUTPUT_BYTES", 10)
+    monkeypatch.setattr(execution, "_READ_CHUNK_SIZE", 4)
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=False),
+        patch("subprocess.Popen") as mock_popen,
+        patch.dict("os.environ", {"SHELL": "/bin/bash"}),
+    ):
+        mock_popen.return_value = _mock_process("0123456789abcdefghij")
+
+        stdout, _, _ = interaction.execute_command("seq 1 100")
+
+    assert stdout == "abcdefghij"
+
+
+def test_execute_command_decodes_output_once():
+    """Raw output is decoded as UTF-8 with replacement and line endings normalized."""
+    with (
+        patch("whai.interaction.execution.is_windows", return_value=False),
+        patch("subprocess.Popen") as mock_popen,
+        patch.dict("os.environ", {"SHELL": "/bin/bash"}),
+    ):
+        process = _mock_process()
+        process.stdout = io.BytesIO("caf\u00e9\r\nline\rprogress\n".encode("utf-8"))
+        process.stderr = io.BytesIO(b"bad \xff byte")
+        mock_popen.return_value = process
+
+        stdout, stderr, _ = interaction.execute_command("some | command")
+
+    assert stdout == "caf\u00e9\nline\nprogress\n"
+    assert stderr == "bad \ufffd byte"
@@ -1,7 +1,8 @@
 """Tests for LLM module."""
 
-import os
 import json
+import logging
+import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -55,6 +56,20 @@ def test_get_base_system_prompt_without_timeout():
     assert "seconds timeout" not in prompt
 
 
+def test_get_base_system_prompt_reads_template_once_but_keeps_cwd_live(tmp_path, monkeypatch):
+    """The template file is read once; the context note still reflects the current CWD."""
+    from whai.llm import prompts
+
+    prompts._read_system_prompt_template.cache_clear()
+    llm.get_base_system_prompt(is_deep_context=True)
+    monkeypatch.chdir(tmp_path)
+    prompt = llm.get_base_system_prompt(is_deep_context=True)
+
+    info = prompts._read_system_prompt_template.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+    assert f"CWD: {tmp_path}" in prompt
+
+
 def test_command_only_system_prompt_is_different_and_contains_execute_shell_focus():
     """Command-only system prompt should be tailored for command-only behavior."""
     base_prompt = llm.get_base_system_prompt(is_deep_context=True)
@@ -124,6 +139,30 @@ def test_llm_provider_init_with_overrides():
     assert provider.temperature == 0.5
 
 
+@pytest.mark.parametrize(
+    "model, expect_temperature",
+    [("gpt-4", True), ("gpt-5-mini", False), ("o3-mini", False)],
+)
+def test_send_message_temperature_policy(model, expect_temperature):
+    """Temperature is only forwarded to models that accept it."""
+    _clear_provider_env_vars()
+    config = create_test_config(
+        default_provider="openai", default_model=model, api_key="test-key"
+    )
+    provider = llm.LLMProvider(
+        config, temperature=0.5, perf_logger=create_test_perf_logger()
+    )
+    response = MagicMock(
+        choices=[MagicMock(message=MagicMock(content="ok", tool_calls=None))]
+    )
+
+    with patch("litellm.completion", return_value=response) as mock_completion:
+        provider.send_message([{"role": "user", "content": "hi"}], stream=False)
+
+    sent = mock_completion.call_args.kwargs
+    assert ("temperature" in sent) is expect_temperature
+
+
 @pytest.mark.integration
 @pytest.mark.api
 def test_send_message_real_api():
@@ -518,6 +557,232 @@ def test_configure_api_keys_no_keys_when_not_configured():
     assert "OPENAI_API_KEY" not in os.environ
 
 
+def test_configure_api_keys_skips_unchanged_env_writes():
+    """Re-creating a provider doesn't rewrite variables that already hold the value."""
+
+    class _RecordingEnviron(dict):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.writes = []
+
+        def __setitem__(self, key, value):
+            self.writes.append(key)
+            super().__setitem__(key, value)
+
+    config = create_test_config(
+        default_provider="openai", default_model="gpt-4", api_key="test-key"
+    )
+
+    env = _RecordingEnviron(OPENAI_API_KEY="test-key")
+    with patch.object(os, "environ", env):
+        llm.LLMProvider(config, perf_logger=create_test_perf_logger())
+    assert env.writes == []
+
+    env = _RecordingEnviron(OPENAI_API_KEY="stale-key")
+    with patch.object(os, "environ", env):
+        llm.LLMProvider(config, perf_logger=create_test_perf_logger())
+    assert env.writes == ["OPENAI_API_KEY"]
+    assert env["OPENAI_API_KEY"] == "test-key"
+
+
+@pytest.mark.parametrize("provider_name, cached", [("anthropic", True), ("openai", False)])
+def test_send_message_marks_static_system_prompt_for_caching(provider_name, cached):
+    """Only Anthropic needs the leading system message tagged with cache_control."""
+    _clear_provider_env_vars()
+    config = create_test_config(
+        default_provider=provider_name, default_model="test-model", api_key="test-key"
+    )
+    provider = llm.LLMProvider(config, perf_logger=create_test_perf_logger())
+    messages = [
+        {"role": "system", "content": "static instructions"},
+        {"role": "user", "content": "CONTEXT:\nCWD: /tmp\n\nhi"},
+    ]
+
+    with patch("litellm.completion") as mock_completion:
+        mock_completion.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content="ok", tool_calls=None))]
+        )
+        provider.send_message(messages, stream=False, tools=[])
+
+    sent = mock_completion.call_args.kwargs["messages"]
+    if cached:
+        assert sent[0]["content"] == [
+            {
+                "type": "text",
+                "text": "static instructions",
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+        # The user message carrying the context and the caller's list are untouched
+        assert sent[1:] == messages[1:]
+        assert messages[0]["content"] == "static instructions"
+    else:
+        assert sent == messages
+
+
+def _make_openai_provider():
+    """Provider for tests that only exercise send_message error handling."""
+    _clear_provider_env_vars()
+    config = create_test_config(
+        default_provider="openai", default_model="gpt-4", api_key="test-key"
+    )
+    return llm.LLMProvider(config, perf_logger=create_test_perf_logger())
+
+
+def test_send_message_maps_provider_errors_to_friendly_messages():
+    """LiteLLM exception types are translated into actionable messages."""
+    from litellm.exceptions import AuthenticationError, RateLimitError
+
+    provider = _make_openai_provider()
+    cases = [
+        (AuthenticationError("bad key", "openai", "gpt-4"), "Authentication failed"),
+        (RateLimitError("slow down", "openai", "gpt-4"), "Rate limit reached"),
+    ]
+    for exc, expected in cases:
+        with patch("litellm.completion", side_effect=exc):
+            with pytest.raises(RuntimeError, match=expected):
+                provider.send_message([{"role": "user", "content": "hi"}], stream=False)
+
+
+@pytest.mark.parametrize(
+    "error_text, expected",
+    [
+        ("LLM Provider NOT provided for foo", "is not recognized"),
+        ("The model `foo` does not exist", "is invalid or unavailable"),
+        ("Insufficient PERMISSION for this key", "Permission denied"),
+        ("Rate limit exceeded", "Rate limit reached"),
+        ("Request Timeout after 30s", "Network or service error"),
+    ],
+)
+def test_send_message_classifies_untyped_errors_by_text(error_text, expected):
+    """Errors without a LiteLLM type are classified case-insensitively by message."""
+    provider = _make_openai_provider()
+    with patch("litellm.completion", side_effect=ValueError(error_text)):
+        with pytest.raises(RuntimeError, match=expected):
+            provider.send_message([{"role": "user", "content": "hi"}], stream=False)
+
+
+def test_send_message_redacts_api_keys_in_fallback_error():
+    """Unclassified errors keep their text but never echo API keys."""
+    provider = _make_openai_provider()
+    with patch(
+        "litellm.completion",
+        side_effect=ValueError("boom with key sk-abcdefghijklmnop in payload"),
+    ):
+        with pytest.raises(RuntimeError) as exc_info:
+            provider.send_message([{"role": "user", "content": "hi"}], stream=False)
+
+    message = str(exc_info.value)
+    assert "boom with key" in message
+    assert "sk-abcdefghijklmnop" not in message
+    assert "<redacted>" in message
+
+
+def test_send_message_serializes_payload_only_when_debug_enabled(caplog):
+    """The debug payload dump is skipped entirely unless DEBUG is enabled."""
+    provider = _make_openai_provider()
+    response = MagicMock(
+        choices=[MagicMock(message=MagicMock(content="ok", tool_calls=None))]
+    )
+    messages = [{"role": "user", "content": "hi"}]
+
+    with (
+        patch("litellm.completion", return_value=response),
+        patch.object(provider, "_log_request_payload") as mock_log_payload,
+    ):
+        caplog.set_level(logging.INFO, logger="whai.llm.provider")
+        provider.send_message(messages, stream=False)
+        mock_log_payload.assert_not_called()
+
+        caplog.set_level(logging.DEBUG, logger="whai.llm.provider")
+        provider.send_message(messages, stream=False)
+        mock_log_payload.assert_called_once()
+
+
+def test_provider_init_preloads_litellm_in_background(monkeypatch):
+    """Creating a provider starts the LiteLLM import; the first request waits for it."""
+    import sys
+
+    from whai.llm import provider as provider_module
+
+    monkeypatch.setattr(provider_module, "_litellm", None)
+    monkeypatch.setattr(provider_module, "_litellm_preload", None)
+
+    _make_openai_provider()
+    preload = provider_module._litellm_preload
+    assert preload is not None
+
+    # A second provider doesn't start another import
+    _make_openai_provider()
+    assert provider_module._litellm_preload is preload
+
+    assert provider_module._get_litellm() is sys.modules["litellm"]
+    assert not preload.is_alive()
+
+
+def test_send_message_skips_stream_perf_wrapper_when_perf_logging_disabled(caplog):
+    """The per-chunk perf wrapper is only added when its records would be logged."""
+    provider = _make_openai_provider()
+    underlying = iter([{"type": "text", "content": "ok"}])
+
+    with (
+        patch("litellm.completion", return_value=iter([])),
+        patch(
+            "whai.llm.provider.handle_streaming_response", return_value=underlying
+        ),
+    ):
+        caplog.set_level(logging.WARNING, logger="whai.utils.perf_logger")
+        assert provider.send_message([{"role": "user", "content": "hi"}]) is underlying
+
+        caplog.set_level(logging.INFO, logger="whai.utils.perf_logger")
+        wrapped = provider.send_message([{"role": "user", "content": "hi"}])
+        assert wrapped is not underlying
+        assert list(wrapped) == [{"type": "text", "content": "ok"}]
+
+
+def test_log_request_payload_reuses_completion_kwargs(caplog):
+    """The debug payload is read from the request kwargs, minus transport settings."""
+    provider = _make_openai_provider()
+    completion_kwargs = {
+        "model": "gpt-4",
+        "messages": [{"role": "user", "content": "hi"}],
+        "stream": False,
+        "drop_params": True,
+        "api_key": "sk-secretsecretsecret",
+        "tools": [llm.EXECUTE_SHELL_TOOL],
+    }
+
+    caplog.set_level(logging.DEBUG, logger="whai.llm.provider")
+    provider._log_request_payload(completion_kwargs)
+
+    payload_record = next(
+        r.getMessage()
+        for r in caplog.records
+        if r.getMessage().startswith("LLM request payload:")
+    )
+    payload = json.loads(payload_record.split("\n", 1)[1])
+    assert payload == {
+        "model": "gpt-4",
+        "messages": completion_kwargs["messages"],
+        "tools": [llm.EXECUTE_SHELL_TOOL],
+    }
+    assert "sk-secretsecretsecret" not in caplog.text
+
+
+def test_log_request_payload_tolerates_unserializable_values(caplog):
+    """Values json can't encode are reported instead of raising from send_message."""
+    provider = _make_openai_provider()
+    completion_kwargs = {
+        "model": "gpt-4",
+        "messages": [{"role": "user", "content": object()}],
+    }
+
+    caplog.set_level(logging.DEBUG, logger="whai.llm.provider")
+    provider._log_request_payload(completion_kwargs)
+
+    assert "LLM request payload: <unserializable>" in caplog.text
+
+
 # ============================================================================
 # End-to-End Integration Tests (Require Running Services)
 # ============================================================================
@@ -1,5 +1,6 @@
 """Unit tests for SessionLogger."""
 
+import io
 import os
 import platform
 import tempfile
@@ -7,6 +8,7 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from rich.console import Console
 
 from whai.core.session_logger import SessionLogger
 
@@ -158,6 +160,19 @@ def test_session_logger_prints_to_console(session_directory):
     )
 
 
+def test_session_logger_write_outputs_text_verbatim(monkeypatch):
+    """SessionLogger.write streams text without markup or a trailing newline."""
+    monkeypatch.delenv("WHAI_SESSION_ACTIVE", raising=False)
+
+    buffer = io.StringIO()
+    logger = SessionLogger(console=Console(file=buffer, force_terminal=False))
+
+    logger.write("Use [bold]ls[/bold] ")
+    logger.write("to list files.")
+
+    assert buffer.getvalue() == "Use [bold]ls[/bold] to list files."
+
+
 @pytest.mark.skipif(platform.system() != "Windows", reason="SessionLogger is Windows-only")
 def test_session_logger_logs_multiple_interactions(session_directory):
     """SessionLogger captures multiple whai interactions in sequence."""
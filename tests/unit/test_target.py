@@ -0,0 +1,44 @@
+"""Tests for target pane utilities."""
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from whai.cli import target
+
+
+def _last_line_by_splitting(output):
+    """The previous implementation: split the whole capture and keep the last non-empty line."""
+    lines = [line for line in output.split("\n") if line.strip()]
+    return lines[-1] if lines else None
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        "build ok\nuser@host:~$ \n\n\n",  # trailing blank lines
+        "user@host:~$ \n   \n\t\n  \n",  # trailing whitespace-only lines
+        "first\n  \nuser@host:~$ ",  # no trailing newline
+        "user@host:~$",  # single line, no newline at all
+        "  indented prompt >  \n",  # surrounding whitespace is kept
+        "\n\nuser@host:~$\n",  # leading blank lines
+        "",  # empty capture
+        "\n\n",  # only newlines
+        "   \n \t \n",  # only whitespace
+    ],
+)
+def test_get_last_line_matches_splitting(output):
+    """The backwards scan returns the same line as splitting the whole capture."""
+    completed = subprocess.CompletedProcess(["tmux"], 0, stdout=output, stderr="")
+    with patch("whai.cli.target._run_tmux", return_value=completed):
+        assert target.get_last_line("%1") == _last_line_by_splitting(output)
+
+
+def test_get_last_line_tmux_failure():
+    """A failed or unavailable tmux capture returns None."""
+    failed = subprocess.CompletedProcess(["tmux"], 1, stdout="prompt $\n", stderr="no pane")
+    with patch("whai.cli.target._run_tmux", return_value=failed):
+        assert target.get_last_line("%1") is None
+    with patch("whai.cli.target._run_tmux", return_value=None):
+        assert target.get_last_line("%1") is None
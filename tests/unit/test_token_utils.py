@@ -162,3 +162,17 @@ def test_truncate_preserves_structure():
     # Should appear after truncation notice
     new_content_part = result.split("CHARACTERS REMOVED")[1]
     assert "NEW CONTENT" in new_content_part
+
+
+def test_truncate_fast_path_skips_estimation(monkeypatch):
+    """Test that short text returns unchanged without estimating tokens."""
+
+    def _fail(_text):
+        raise AssertionError("_estimate_tokens should not be called")
+
+    monkeypatch.setattr(token_utils, "_estimate_tokens", _fail)
+    text = "A" * 100
+    result, was_truncated = token_utils.truncate_text_with_tokens(text, 25)
+
+    assert result == text
+    assert was_truncated is False
@@ -35,8 +35,7 @@ from whai.core.executor import run_conversation_loop
 from whai.llm import (
     EXECUTE_SHELL_TOOL,
     LLMProvider,
-    get_base_system_prompt,
-    get_command_only_system_prompt,
+    get_system_prompt_parts,
 )
 from whai.llm.token_utils import truncate_text_with_tokens
 from whai.logging_setup import configure_logging, get_logger
@@ -254,14 +253,13 @@ def _build_initial_messages(
     command_only: bool = False,
 ) -> List[dict]:
     """Build initial conversation messages with system prompt and user query."""
-    if command_only:
-        base_prompt = get_command_only_system_prompt(is_deep_context, timeout=timeout)
-    else:
-        base_prompt = get_base_system_prompt(is_deep_context, timeout=timeout)
+    static_prompt, context_prompt = get_system_prompt_parts(
+        is_deep_context, timeout=timeout, command_only=command_only
+    )
     role_header = f"=== ROLE INSTRUCTIONS (active role: {role_obj.name}) ==="
     system_message = "\n\n".join(
         [
-            base_prompt.rstrip(),
+            static_prompt,
             role_header,
             role_obj.body.strip(),
         ]
@@ -277,9 +275,12 @@ def _build_initial_messages(
         logger.info("No terminal context available; sending user query only")
         user_message = query_str
     
+    # Volatile context (CWD, date/time) opens the user message so the system
+    # message stays identical across runs for prompt caching. A second system
+    # message would break chat templates that require alternating roles
     messages = [
         {"role": "system", "content": system_message},
-        {"role": "user", "content": user_message},
+        {"role": "user", "content": f"{context_prompt}\n\n{user_message}"},
     ]
     
     startup_perf.log_section("Message construction", extra_info={"message_count": len(messages)})
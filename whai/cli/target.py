@@ -80,8 +80,15 @@ def get_last_line(pane_id: str) -> Optional[str]:
     """
     result = _run_tmux(["capture-pane", "-t", pane_id, "-p"])
     if result is not None and result.returncode == 0:
-        lines = [line for line in result.stdout.split('\n') if line.strip()]
-        return lines[-1] if lines else None
+        # Walk backwards from the end so only the tail of the capture is scanned
+        output = result.stdout
+        end = len(output)
+        while end > 0:
+            start = output.rfind('\n', 0, end) + 1
+            line = output[start:end]
+            if line.strip():
+                return line
+            end = start - 1
     return None
 
 
@@ -24,6 +24,12 @@ DEFAULT_MODEL_MISTRAL = "mistral-small-latest"
 
 # Model prefixes for special handling
 GPT5_MODEL_PREFIX = "gpt-5"
+# Models that reject a custom temperature (gpt-5 and OpenAI o-series reasoning models)
+NO_TEMPERATURE_MODEL_PREFIXES = (GPT5_MODEL_PREFIX, "o1", "o3", "o4")
+
+# Streaming: coalesce text deltas arriving in quick succession before display
+DEFAULT_STREAM_BATCH_CHARS = 256  # Flush buffered text once it reaches this many chars
+DEFAULT_STREAM_FLUSH_MS = 25  # ...or once this long has passed since the last flush
 
 # API defaults
 DEFAULT_AZURE_API_VERSION = "2023-05-15"
@@ -92,6 +98,7 @@ def get_default_model_for_provider(provider: str) -> str:
 # ============================================================================
 
 DEFAULT_COMMAND_TIMEOUT = 60  # Per-command timeout for execute_command
+DEFAULT_TERMINATION_GRACE = 2  # Wait after a graceful stop before force-killing a timed-out command
 CONTEXT_CAPTURE_TIMEOUT = 5  # Timeout for tmux/history context capture
 WSL_CHECK_TIMEOUT = 2  # Timeout for WSL availability check
 
@@ -105,6 +112,7 @@ HISTORY_MAX_COMMANDS = 50  # Maximum number of commands from shell history
 # Token limits for truncation (to prevent exceeding model context limits)
 CONTEXT_MAX_TOKENS = 200_000  # Maximum tokens for terminal context
 TOOL_OUTPUT_MAX_TOKENS = 50_000  # Maximum tokens for individual command outputs
+MAX_CAPTURED_OUTPUT_BYTES = 4_000_000  # Per-stream cap on captured command output (keeps the tail)
 
 # Terminal output limits (for display truncation)
 TERMINAL_OUTPUT_MAX_LINES = 500  # Maximum lines to display in terminal (0 = no limit)
@@ -142,3 +150,4 @@ ENV_WHAI_LOG_LEVEL = "WHAI_LOG_LEVEL"
 ENV_WHAI_VERBOSE_DEPS = "WHAI_VERBOSE_DEPS"
 ENV_WHAI_MOCK_TOOLCALL = "WHAI_MOCK_TOOLCALL"
 ENV_WHAI_TARGET = "WHAI_TARGET"
+ENV_WHAI_POWERSHELL_PROFILE = "WHAI_POWERSHELL_PROFILE"
@@ -1,7 +1,9 @@
 """Conversation loop execution for whai."""
 
 import asyncio
+import itertools
 import json
+import traceback
 from typing import Any, Dict, List, Optional
 
 from whai import ui
@@ -26,6 +28,36 @@ NO_TOOL_CALL_RECOVERY_HINT = (
 )
 
 
+def _dedupe_tool_output(
+    output: str, tool_call_id: str, command: str, seen: Dict[str, str]
+) -> str:
+    """
+    Replace a command result already sent earlier in the conversation.
+
+    The earlier result stays in the message history, so a short reference to
+    it carries the same information with fewer tokens. The reference is only
+    used when it is actually shorter than the output.
+    """
+    earlier_id = seen.get(output)
+    if earlier_id is None:
+        seen[output] = tool_call_id
+        return output
+
+    reference = (
+        f"Command: {command}\n"
+        f"Output identical to earlier tool result {earlier_id}."
+    )
+    if len(reference) >= len(output):
+        return output
+
+    logger.debug(
+        "Tool output identical to earlier result %s; sending reference",
+        earlier_id,
+        extra={"category": "cmd"},
+    )
+    return reference
+
+
 def run_conversation_loop(
     llm_provider: LLMProvider,
     messages: List[dict],
@@ -105,6 +137,8 @@ def run_conversation_loop(
     loop_iteration = 0
     no_tool_call_retries = 0
     next_tool_choice = None
+    # Command results already sent this conversation, mapped to their tool call id
+    seen_tool_outputs: Dict[str, str] = {}
     try:
         while True:
             loop_iteration += 1
@@ -146,32 +180,26 @@ def run_conversation_loop(
                             "Expected streaming response but received non-streaming payload"
                         )
                     response_stream = response
-                    response_chunks = []
                     first_chunk = None
                     for chunk in response_stream:
                         first_chunk = chunk
                         break
                 loop_perf.log_section("LLM API call (streaming)")
 
-                # Print first chunk and continue streaming
+                # Split text and tool calls in a single pass while streaming
+                text_parts: List[str] = []
+                tool_calls: List[Dict[str, Any]] = []
                 if first_chunk is not None:
-                    response_chunks.append(first_chunk)
-                    if first_chunk["type"] == "text":
-                        session_logger.print(
-                            first_chunk["content"], end="", soft_wrap=True
-                        )
-                for chunk in response_stream:
-                    response_chunks.append(chunk)
-                    if chunk["type"] == "text":
-                        session_logger.print(chunk["content"], end="", soft_wrap=True)
-                if any(c["type"] == "text" for c in response_chunks):
+                    for chunk in itertools.chain((first_chunk,), response_stream):
+                        if chunk["type"] == "text":
+                            text_parts.append(chunk["content"])
+                            session_logger.write(chunk["content"])
+                        elif chunk["type"] == "tool_call":
+                            tool_calls.append(chunk)
+                if text_parts:
                     session_logger.print()
 
-                # Extract tool calls from chunks
-                tool_calls = [c for c in response_chunks if c["type"] == "tool_call"]
-                assistant_content = "".join(
-                    c["content"] for c in response_chunks if c["type"] == "text"
-                )
+                assistant_content = "".join(text_parts)
                 logger.debug(
                     "Received %d tool calls from stream",
                     len(tool_calls),
@@ -263,6 +291,7 @@ def run_conversation_loop(
                                 {
                                     "tool_call_id": tool_call["id"],
                                     "output": "Command rejected by user.",
+                                    "rejected": True,
                                 }
                             )
                             continue
@@ -300,10 +329,15 @@ def run_conversation_loop(
                                             f"Command sent to pane {target_pane} (timed out waiting for completion)"
                                         )
 
-                                    result = f"Command executed in pane {target_pane}: {approved_command}\n"
-                                    result += f"Completed: {'yes' if completed else 'no (timeout)'}\n"
+                                    result_parts = [
+                                        f"Command executed in pane {target_pane}: {approved_command}\n",
+                                        f"Completed: {'yes' if completed else 'no (timeout)'}\n",
+                                    ]
                                     if new_context:
-                                        result += f"\nRecent pane output:\n{new_context[-2000:]}"
+                                        result_parts.append(
+                                            f"\nRecent pane output:\n{new_context[-2000:]}"
+                                        )
+                                    result = "".join(result_parts)
 
                                     tool_results.append(
                                         {
@@ -361,17 +395,23 @@ def run_conversation_loop(
                                     stdout, stderr, returncode
                                 )
 
-                                # Format the result for LLM (plain text)
-                                result = f"Command: {approved_command}\n"
-                                result += f"Exit code: {returncode}\n"
+                                # Format the result for LLM (plain text); join once so
+                                # large outputs are copied a single time
+                                result_parts = [
+                                    f"Command: {approved_command}\n",
+                                    f"Exit code: {returncode}\n",
+                                ]
                                 if stdout:
-                                    result += f"\nOutput:\n{stdout}"
+                                    result_parts.append("\nOutput:\n")
+                                    result_parts.append(stdout)
                                 if stderr:
-                                    result += f"\nErrors:\n{stderr}"
+                                    result_parts.append("\nErrors:\n")
+                                    result_parts.append(stderr)
                                 if not stdout and not stderr:
-                                    result += (
+                                    result_parts.append(
                                         "\nOutput: (empty - command produced no output)"
                                     )
+                                result = "".join(result_parts)
 
                                 # Truncate tool output if needed to respect token limits
                                 truncated_result, was_truncated = (
@@ -392,7 +432,12 @@ def run_conversation_loop(
                                 tool_results.append(
                                     {
                                         "tool_call_id": tool_call["id"],
-                                        "output": truncated_result,
+                                        "output": _dedupe_tool_output(
+                                            truncated_result,
+                                            tool_call["id"],
+                                            approved_command,
+                                            seen_tool_outputs,
+                                        ),
                                     }
                                 )
 
@@ -473,6 +518,7 @@ def run_conversation_loop(
                                         {
                                             "tool_call_id": tool_call["id"],
                                             "output": "Tool call rejected by user.",
+                                            "rejected": True,
                                         }
                                     )
                                     continue
@@ -544,7 +590,7 @@ def run_conversation_loop(
 
                 # Decide whether to end the conversation
                 all_rejected = tool_results and all(
-                    "rejected" in r["output"].lower() for r in tool_results
+                    r.get("rejected") for r in tool_results
                 )
 
                 if not tool_results and tool_calls:
@@ -574,7 +620,9 @@ def run_conversation_loop(
                             "type": "function",
                             "function": {
                                 "name": tc["name"],
-                                "arguments": json.dumps(tc["arguments"]),
+                                # Reuse the provider's JSON string when available
+                                "arguments": tc.get("arguments_raw")
+                                or json.dumps(tc["arguments"], separators=(",", ":")),
                             },
                         }
                         for tc in tool_calls
@@ -610,8 +658,6 @@ def run_conversation_loop(
                 loop_perf.log_complete(extra_info={"ended": "keyboard_interrupt"})
                 break
             except Exception as e:
-                import traceback
-
                 text = str(e)
                 # Check for LLM-related errors (API errors, model errors, auth errors, etc.)
                 if (
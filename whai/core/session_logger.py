@@ -93,6 +93,21 @@ class SessionLogger:
         if self.enabled:
             self._append_to_log(text + end)
     
+    def write(self, text: str) -> None:
+        """
+        Write streamed text to console as-is and log to session file.
+
+        Uses Console.out, which skips markup parsing, highlighting and
+        wrapping, so model output is shown verbatim with minimal overhead.
+
+        Args:
+            text: Raw text chunk to write (no newline appended).
+        """
+        self.console.out(text, end="", highlight=False)
+
+        if self.enabled:
+            self._append_to_log(text)
+    
     def log_command(self, command: str) -> None:
         """
         Log an executed command to the session file.
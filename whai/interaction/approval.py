@@ -1,6 +1,9 @@
 """Command approval loop for whai."""
 
-from typing import Any, Dict, Optional
+import json
+import os
+import sys
+from typing import Any, Dict, Optional, Set
 
 from rich.text import Text
 
@@ -10,6 +13,132 @@ from whai.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Prompts are identical on every iteration, so build them once
+_COMMAND_PROMPT = Text(
+    "[a]pprove / approve for [s]ession / [r]eject / [m]odify: ",
+    style=UI_TEXT_STYLE_PROMPT,
+)
+_TOOL_PROMPT = Text(
+    "[a]pprove / approve for [s]ession / [r]eject: ", style=UI_TEXT_STYLE_PROMPT
+)
+
+
+# Keys that are ignored while waiting for a single-key choice
+_IGNORED_KEYS = ("\r", "\n", " ")
+
+# Accepted answers for each approval choice
+_APPROVE = frozenset({"a", "approve"})
+_REJECT = frozenset({"r", "reject"})
+_MODIFY = frozenset({"m", "modify"})
+_SESSION = frozenset({"s", "session"})
+
+# Exact commands and tool calls the user approved for the rest of this run
+_SESSION_APPROVALS: Set[str] = set()
+
+
+def _command_key(command: str) -> str:
+    """Session approval key for a shell command (the literal command text)."""
+    return f"cmd:{command}"
+
+
+def _tool_key(tool_name: str, tool_args: Dict[str, Any]) -> str:
+    """Session approval key for an MCP tool call with these exact arguments."""
+    args_json = json.dumps(tool_args, sort_keys=True, ensure_ascii=False, default=str)
+    return f"tool:{tool_name}|{args_json}"
+
+
+def _read_key() -> str:
+    """
+    Read a single keypress from the terminal without waiting for Enter.
+
+    Pending typeahead is discarded first so keys pressed while the model was
+    still responding cannot answer the prompt.
+
+    Raises:
+        KeyboardInterrupt: On Ctrl-C.
+        EOFError: On Ctrl-D (POSIX) or Ctrl-Z (Windows).
+    """
+    if sys.platform.startswith("win"):
+        import msvcrt
+
+        while msvcrt.kbhit():
+            msvcrt.getwch()
+        while True:
+            key = msvcrt.getwch()
+            if key == "\x03":
+                raise KeyboardInterrupt
+            if key == "\x1a":
+                raise EOFError
+            if key not in _IGNORED_KEYS:
+                return key
+
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    try:
+        old_attrs = termios.tcgetattr(fd)
+    except termios.error as e:
+        raise OSError(f"stdin is not a configurable terminal: {e}") from e
+    try:
+        # cbreak keeps Ctrl-C working; TCSAFLUSH drops pending typeahead
+        tty.setcbreak(fd, termios.TCSAFLUSH)
+        while True:
+            key = os.read(fd, 1).decode("utf-8", errors="replace")
+            if key in ("", "\x04"):
+                raise EOFError
+            if key not in _IGNORED_KEYS:
+                return key
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+
+
+def _read_choice() -> str:
+    """
+    Read the user's answer to an approval prompt.
+
+    On an interactive terminal the first keypress is used directly and echoed
+    back. Piped or redirected input falls back to reading a full line.
+    """
+    try:
+        interactive = sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        interactive = False
+
+    if interactive:
+        try:
+            key = _read_key()
+        except (ImportError, OSError) as e:
+            logger.debug(
+                "Single-key input unavailable, using line input: %s",
+                e,
+                extra={"category": "cmd"},
+            )
+        else:
+            ui.console.print(key)
+            return key.lower()
+
+    return input().strip().lower()
+
+
+def _input_prefilled(prompt: str, text: str) -> str:
+    """
+    Read a line of input with ``text`` pre-filled and editable.
+
+    Falls back to an empty prompt where readline is unavailable (e.g. Windows
+    without pyreadline3).
+    """
+    try:
+        import readline
+    except ImportError:
+        return input(prompt)
+
+    readline.set_startup_hook(lambda: readline.insert_text(text))
+    try:
+        return input(prompt)
+    finally:
+        readline.set_startup_hook(None)
+
 
 def approval_loop(command: str) -> Optional[str]:
     """
@@ -24,23 +153,32 @@ def approval_loop(command: str) -> Optional[str]:
     ui.console.print()
     ui.print_command(command)
 
+    key = _command_key(command)
+    if key in _SESSION_APPROVALS:
+        ui.info("Approved earlier in this session.")
+        logger.debug("Command approved by session approval", extra={"category": "cmd"})
+        return command
+
     while True:
         try:
-            ui.console.print(
-                Text("[a]pprove / [r]eject / [m]odify: ", style=UI_TEXT_STYLE_PROMPT),
-                end="",
-            )
-            response = input().strip().lower()
+            ui.console.print(_COMMAND_PROMPT, end="")
+            response = _read_choice()
 
-            if response == "a" or response == "approve":
+            if response in _APPROVE:
                 logger.debug("Command approved as-is", extra={"category": "cmd"})
                 return command
-            elif response == "r" or response == "reject":
+            elif response in _SESSION:
+                _SESSION_APPROVALS.add(key)
+                logger.debug(
+                    "Command approved for this session", extra={"category": "cmd"}
+                )
+                return command
+            elif response in _REJECT:
                 ui.info("Command rejected.")
                 logger.debug("Command rejected by user", extra={"category": "cmd"})
                 return None
-            elif response == "m" or response == "modify":
-                modified = input("Enter modified command: ").strip()
+            elif response in _MODIFY:
+                modified = _input_prefilled("Edit command: ", command).strip()
                 if modified:
                     logger.debug(
                         "Command modified by user: %s",
@@ -51,7 +189,7 @@ def approval_loop(command: str) -> Optional[str]:
                 else:
                     ui.warn("No command entered. Please try again.")
             else:
-                ui.warn("Invalid response. Please enter 'a', 'r', or 'm'.")
+                ui.warn("Invalid response. Please enter 'a', 's', 'r', or 'm'.")
         except (EOFError, KeyboardInterrupt):
             ui.info("\nRejected.")
             logger.debug(
@@ -81,23 +219,32 @@ def approve_tool(
     ui.console.print()
     ui.print_tool(tool_name, tool_args, display_name=display_name, description=description)
 
+    key = _tool_key(tool_name, tool_args)
+    if key in _SESSION_APPROVALS:
+        ui.info("Approved earlier in this session.")
+        logger.debug("Tool call approved by session approval", extra={"category": "mcp"})
+        return True
+
     while True:
         try:
-            ui.console.print(
-                Text("[a]pprove / [r]eject: ", style=UI_TEXT_STYLE_PROMPT),
-                end="",
-            )
-            response = input().strip().lower()
+            ui.console.print(_TOOL_PROMPT, end="")
+            response = _read_choice()
 
-            if response == "a" or response == "approve":
+            if response in _APPROVE:
                 logger.debug("Tool call approved", extra={"category": "mcp"})
                 return True
-            elif response == "r" or response == "reject":
+            elif response in _SESSION:
+                _SESSION_APPROVALS.add(key)
+                logger.debug(
+                    "Tool call approved for this session", extra={"category": "mcp"}
+                )
+                return True
+            elif response in _REJECT:
                 ui.info("Tool call rejected.")
                 logger.debug("Tool call rejected by user", extra={"category": "mcp"})
                 return False
             else:
-                ui.warn("Invalid response. Please enter 'a' or 'r'.")
+                ui.warn("Invalid response. Please enter 'a', 's', or 'r'.")
         except (EOFError, KeyboardInterrupt):
             ui.info("\nRejected.")
             logger.debug(
@@ -1,16 +1,283 @@
 """Command execution for whai."""
 
+import functools
+import logging
 import os
 import shutil
+import signal
 import subprocess
-from typing import Tuple
+import sys
+import threading
+import time
+from collections import deque
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
 
-from whai.constants import DEFAULT_COMMAND_TIMEOUT
+from whai.constants import (
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_TERMINATION_GRACE,
+    ENV_WHAI_POWERSHELL_PROFILE,
+    MAX_CAPTURED_OUTPUT_BYTES,
+)
 from whai.logging_setup import get_logger
 from whai.utils import detect_shell, is_windows
 
 logger = get_logger(__name__)
 
+# Output capture settings shared by every command invocation. Pipes are read
+# as raw bytes and decoded once at the end instead of incrementally.
+_CAPTURE_KWARGS: Dict[str, Any] = {
+    "stdout": subprocess.PIPE,
+    "stderr": subprocess.PIPE,
+}
+
+# Maximum bytes read from a command's pipe per call
+_READ_CHUNK_SIZE = 65536
+
+# Anything that needs the shell to interpret it: operators, redirection,
+# expansion, quoting, escapes, comments and multi-line scripts
+_SHELL_METACHARACTERS = frozenset(";|&<>$(){}[]*?~`'\"\\#\n")
+
+
+@functools.lru_cache(maxsize=1)
+def _shell_argv_prefix() -> Tuple[str, ...]:
+    """
+    Resolve the shell invocation prefix that commands are appended to.
+
+    Shell detection and PATH lookups don't change within a process, so this
+    runs once; call ``_shell_argv_prefix.cache_clear()`` to re-resolve.
+
+    PowerShell is started with -NoProfile -NonInteractive -NoLogo to skip
+    loading $PROFILE on every command; set WHAI_POWERSHELL_PROFILE=1 to keep
+    profile functions and aliases available.
+    """
+    if is_windows():
+        # Windows: use detected shell (PowerShell or cmd)
+        # Don't use shell=True to ensure timeout works properly.
+        # When shell=True, subprocess wraps command in cmd.exe, creating a process hierarchy.
+        # On Windows, killing the parent (cmd.exe) doesn't properly terminate child processes
+        # (PowerShell), causing timeouts to fail. Invoking the shell directly avoids this issue.
+        shell_type = detect_shell()
+        if shell_type == "pwsh" or shell_type == "powershell":
+            # PowerShell: detect_shell() already determined which version is available
+            # Resolve to actual executable path
+            shell_exe = shutil.which(shell_type) or shutil.which("powershell") or "powershell.exe"
+            if os.getenv(ENV_WHAI_POWERSHELL_PROFILE, "").strip() == "1":
+                return (shell_exe, "-Command")
+            return (shell_exe, "-NoProfile", "-NonInteractive", "-NoLogo", "-Command")
+        # CMD or unknown Windows shell: use cmd.exe as fallback
+        return ("cmd.exe", "/c")
+
+    # Unix-like systems: use detected shell or fallback
+    # Don't use shell=True to ensure timeout works properly
+    return (os.environ.get("SHELL", "/bin/sh"), "-c")
+
+
+# Names a shell resolves before PATH: POSIX special and regular builtins,
+# reserved words, and common bash/zsh builtins. Running the PATH program
+# instead changes behavior (pwd prints the physical path, time is GNU time)
+_SHELL_BUILTINS = frozenset(
+    """
+    ! . : [ [[ ]] { } alias autoload bg bind break builtin caller case cd
+    command compgen complete continue declare dirs disown do done echo elif
+    else enable esac eval exec exit export false fc fg fi for function
+    getopts hash help history if in jobs kill let local logout mapfile
+    newgrp popd print printf pushd pwd read readarray readonly return
+    select set shift shopt source suspend test then time times trap true
+    type typeset ulimit umask unalias unset until wait whence where which
+    while
+    """.split()
+)
+
+# Shells that read no startup files for ``-c`` (bash only without BASH_ENV),
+# so skipping them can't lose PATH entries or shims those files set up
+_SHELLS_WITHOUT_STARTUP_FILES = frozenset({"sh", "dash", "bash"})
+
+
+@functools.lru_cache(maxsize=256)
+def _which(program: str) -> Optional[str]:
+    """Cached ``shutil.which``; call ``_which.cache_clear()`` after PATH changes."""
+    return shutil.which(program)
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """
+    Return an argv that can be executed without a shell, or None.
+
+    Plain ``program arg ...`` commands skip the shell's fork/exec when the
+    shell would run the same program: anything with shell syntax, builtins
+    and keywords, env assignments and programs missing from PATH still go
+    through the shell, as does every command when the shell reads startup
+    files for ``-c`` (zsh's .zshenv, fish's config, BASH_ENV). Windows always
+    uses the shell, since PowerShell aliases (ls, cat, curl) would otherwise
+    resolve to different programs.
+    """
+    if is_windows() or _SHELL_METACHARACTERS.intersection(command):
+        return None
+    shell = os.path.basename(_shell_argv_prefix()[0])
+    if shell not in _SHELLS_WITHOUT_STARTUP_FILES or (
+        shell == "bash" and os.environ.get("BASH_ENV")
+    ):
+        return None
+    # With no quotes or escapes left, whitespace splitting matches shlex.split
+    argv = command.split()
+    if (
+        not argv
+        or argv[0] in _SHELL_BUILTINS
+        or "=" in argv[0]  # VAR=value prefix
+        or _which(argv[0]) is None
+    ):
+        return None
+    return argv
+
+
+def _drain_pipe(pipe: IO[bytes], chunks: Deque[bytes], limit: int) -> None:
+    """
+    Read a pipe to EOF, keeping roughly the last ``limit`` bytes.
+
+    Older chunks are dropped once the limit is exceeded, matching the
+    keep-the-most-recent-output truncation applied downstream.
+    """
+    size = 0
+    try:
+        for chunk in iter(lambda: pipe.read1(_READ_CHUNK_SIZE), b""):
+            chunks.append(chunk)
+            size += len(chunk)
+            while size - len(chunks[0]) >= limit:
+                size -= len(chunks.popleft())
+    except (OSError, ValueError):
+        # Pipe closed underneath us; keep whatever was read
+        pass
+
+
+def _start_reader(pipe: IO[bytes], chunks: Deque[bytes]) -> threading.Thread:
+    """Drain a pipe on a daemon thread so the command never blocks on a full pipe."""
+    reader = threading.Thread(
+        target=_drain_pipe, args=(pipe, chunks, MAX_CAPTURED_OUTPUT_BYTES), daemon=True
+    )
+    reader.start()
+    return reader
+
+
+def _collect(chunks: Deque[bytes]) -> str:
+    """
+    Join captured chunks into text, keeping the most recent MAX_CAPTURED_OUTPUT_BYTES.
+
+    Decodes as UTF-8 with replacement and normalizes CRLF and CR line endings
+    to LF, matching what text-mode pipes produced.
+    """
+    data = b"".join(chunks)
+    if len(data) > MAX_CAPTURED_OUTPUT_BYTES:
+        logger.debug(
+            "Captured output capped; dropped %d leading bytes",
+            len(data) - MAX_CAPTURED_OUTPUT_BYTES,
+            extra={"category": "cmd"},
+        )
+        data = data[-MAX_CAPTURED_OUTPUT_BYTES:]
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _new_process_group_kwargs() -> Dict[str, Any]:
+    """
+    Popen arguments that start a command in its own process group.
+
+    The command stays in whai's session so it keeps the controlling terminal
+    (sudo, ssh and git credential prompts open /dev/tty), while its group can
+    still be signalled as a whole.
+    """
+    if sys.version_info >= (3, 11):
+        return {"process_group": 0}
+    return {"preexec_fn": os.setpgrp}
+
+
+def _foreground_terminal() -> Optional[int]:
+    """
+    Return stdin's descriptor if whai owns the terminal's foreground, else None.
+
+    Only the main thread can hand the terminal over, since taking it back
+    requires ignoring SIGTTOU for a moment.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    try:
+        fd = sys.stdin.fileno()
+        if os.isatty(fd) and os.tcgetpgrp(fd) == os.getpgrp():
+            return fd
+    except (AttributeError, ValueError, OSError):
+        pass
+    return None
+
+
+def _set_foreground(fd: int, pgid: int) -> None:
+    """Make ``pgid`` the terminal's foreground process group."""
+    # A background group changing the foreground is sent SIGTTOU, which
+    # would stop whai when it takes the terminal back
+    previous = signal.signal(signal.SIGTTOU, signal.SIG_IGN)
+    try:
+        os.tcsetpgrp(fd, pgid)
+    except OSError as e:
+        logger.debug(
+            "Could not hand terminal to process group %d: %s",
+            pgid,
+            e,
+            extra={"category": "cmd"},
+        )
+    finally:
+        signal.signal(signal.SIGTTOU, previous)
+
+
+def _signal_process_group(process: subprocess.Popen, force: bool) -> None:
+    """Send a stop (or kill, if ``force``) signal to a command's process group."""
+    if is_windows():
+        if force:
+            # process.kill() would only end the shell; /T takes down its tree
+            result = subprocess.run(
+                ["taskkill", "/T", "/F", "/PID", str(process.pid)],
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                process.kill()
+        else:
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+
+
+def _kill_process_group(
+    process: subprocess.Popen, grace: float = DEFAULT_TERMINATION_GRACE
+) -> None:
+    """
+    Stop a command's process and every child it spawned.
+
+    The process was started in its own process group, so the whole group can
+    be signalled at once instead of orphaning grandchildren. The
+    group is asked to stop first and force-killed once ``grace`` seconds pass.
+    On Windows the force-kill ends the shell's process tree with taskkill.
+    """
+    try:
+        _signal_process_group(process, force=False)
+        try:
+            process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            pass
+        # Children may outlive the shell, so always finish with a hard kill
+        _signal_process_group(process, force=True)
+    except ProcessLookupError:
+        # Everything in the group already exited
+        pass
+    except (OSError, AttributeError, ValueError) as e:
+        logger.debug(
+            "Process group kill failed, killing process only: %s",
+            e,
+            extra={"category": "cmd"},
+        )
+        try:
+            process.kill()
+        except OSError:
+            pass
+
 
 def execute_command(
     command: str, timeout: int = DEFAULT_COMMAND_TIMEOUT
@@ -36,56 +303,76 @@ def execute_command(
     timeout_for_subprocess = None if timeout == 0 else timeout
 
     try:
+        args = _direct_argv(command) or [*_shell_argv_prefix(), command]
+        terminal = None
         if is_windows():
-            # Windows: use detected shell (PowerShell or cmd)
-            # Don't use shell=True to ensure timeout works properly.
-            # When shell=True, subprocess wraps command in cmd.exe, creating a process hierarchy.
-            # On Windows, killing the parent (cmd.exe) doesn't properly terminate child processes
-            # (PowerShell), causing timeouts to fail. Invoking the shell directly avoids this issue.
-            shell_type = detect_shell()
-            if shell_type == "pwsh" or shell_type == "powershell":
-                # PowerShell: detect_shell() already determined which version is available
-                # Resolve to actual executable path
-                shell_exe = shutil.which(shell_type) or shutil.which("powershell") or "powershell.exe"
-                result = subprocess.run(
-                    [shell_exe, "-Command", command],
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    timeout=timeout_for_subprocess,
-                )
-            else:
-                # CMD or unknown Windows shell: use cmd.exe as fallback
-                result = subprocess.run(
-                    ["cmd.exe", "/c", command],
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    timeout=timeout_for_subprocess,
-                )
+            # New process group so the whole tree can be interrupted on timeout
+            group_kwargs: Dict[str, Any] = {
+                "creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+            }
         else:
-            # Unix-like systems: use detected shell or fallback
-            # Don't use shell=True to ensure timeout works properly
-            shell = os.environ.get("SHELL", "/bin/sh")
-            result = subprocess.run(
-                [shell, "-c", command],
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                timeout=timeout_for_subprocess,
-            )
+            # New process group so the whole tree can be killed on timeout
+            group_kwargs = _new_process_group_kwargs()
+            terminal = _foreground_terminal()
 
-        logger.debug(
-            "Command completed; stdout_len=%d stderr_len=%d rc=%d",
-            len(result.stdout),
-            len(result.stderr),
-            result.returncode,
-            extra={"category": "cmd"},
+        process = subprocess.Popen(args, **_CAPTURE_KWARGS, **group_kwargs)
+        if terminal is not None:
+            # Give the command the terminal like a shell does for a foreground
+            # job, so prompts can read it and Ctrl-C reaches the command
+            _set_foreground(terminal, process.pid)
+            try:
+                # Resume it if it touched the terminal before the hand-over
+                os.killpg(process.pid, signal.SIGCONT)
+            except OSError:
+                pass
+        stdout_chunks: Deque[bytes] = deque()
+        stderr_chunks: Deque[bytes] = deque()
+        readers = [
+            _start_reader(process.stdout, stdout_chunks),
+            _start_reader(process.stderr, stderr_chunks),
+        ]
+        deadline = (
+            None
+            if timeout_for_subprocess is None
+            else time.monotonic() + timeout_for_subprocess
         )
-        return result.stdout, result.stderr, result.returncode
+        try:
+            process.wait(timeout=timeout_for_subprocess)
+            if terminal is not None and process.returncode in (
+                -signal.SIGINT,
+                128 + signal.SIGINT,
+            ):
+                # Ctrl-C went to the command's group, not to whai; pass it on
+                raise KeyboardInterrupt
+            # Background children can hold the pipes open after the shell exits
+            for reader in readers:
+                reader.join(
+                    None if deadline is None else max(0.0, deadline - time.monotonic())
+                )
+                if reader.is_alive():
+                    raise subprocess.TimeoutExpired(args, timeout_for_subprocess)
+        except BaseException:
+            # Timeout or Ctrl-C: kill the shell and anything it spawned, then
+            # let the readers hit EOF
+            _kill_process_group(process)
+            for reader in readers:
+                reader.join(DEFAULT_TERMINATION_GRACE)
+            raise
+        finally:
+            if terminal is not None:
+                _set_foreground(terminal, os.getpgrp())
+
+        stdout = _collect(stdout_chunks)
+        stderr = _collect(stderr_chunks)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Command completed; stdout_len=%d stderr_len=%d rc=%d",
+                len(stdout),
+                len(stderr),
+                process.returncode,
+                extra={"category": "cmd"},
+            )
+        return stdout, stderr, process.returncode
 
     except subprocess.TimeoutExpired:
         timeout_msg = f"{timeout} seconds" if timeout > 0 else "infinite timeout"
@@ -1,12 +1,17 @@
 """LLM provider functionality for whai."""
 
-from whai.llm.prompts import get_base_system_prompt, get_command_only_system_prompt
+from whai.llm.prompts import (
+    get_base_system_prompt,
+    get_command_only_system_prompt,
+    get_system_prompt_parts,
+)
 from whai.llm.provider import EXECUTE_SHELL_TOOL, TASK_COMPLETE_TOOL, LLMProvider
 
 __all__ = [
     "LLMProvider",
     "get_base_system_prompt",
     "get_command_only_system_prompt",
+    "get_system_prompt_parts",
     "EXECUTE_SHELL_TOOL",
     "TASK_COMPLETE_TOOL",
 ]
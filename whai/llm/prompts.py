@@ -1,5 +1,6 @@
 """System prompt generation for whai."""
 
+import functools
 import os
 import platform
 from datetime import datetime
@@ -11,6 +12,12 @@ from whai.logging_setup import get_logger
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _os_info() -> str:
+    """Operating system name and release; constant for the process lifetime."""
+    return f"{platform.system()} {platform.release()}"
+
+
 def _build_context_note(is_deep_context: bool, timeout: int | None) -> str:
     """Build the dynamic context note shared by all system prompts."""
     context_parts: list[str] = []
@@ -29,9 +36,7 @@ def _build_context_note(is_deep_context: bool, timeout: int | None) -> str:
     system_info: list[str] = []
 
     # Operating system
-    os_name = platform.system()
-    os_release = platform.release()
-    system_info.append(f"OS: {os_name} {os_release}")
+    system_info.append(f"OS: {_os_info()}")
 
     # Shell (from environment or detect)
     shell_path = os.environ.get("SHELL", "")
@@ -79,7 +84,9 @@ def _build_context_note(is_deep_context: bool, timeout: int | None) -> str:
     return " ".join(context_parts)
 
 
-def _load_system_prompt_template(filename: str, context_note: str) -> str:
+@functools.lru_cache(maxsize=None)
+def _read_system_prompt_template(filename: str) -> str:
+    """Read a packaged system prompt template; templates are read once per process."""
     system_prompt_file = files("whai").joinpath("defaults", filename)
 
     if not system_prompt_file.exists():
@@ -93,7 +100,34 @@ def _load_system_prompt_template(filename: str, context_note: str) -> str:
         "Loaded system prompt template from %s",
         system_prompt_file,
     )
-    return template.format(context_note=context_note)
+    return template
+
+
+def get_system_prompt_parts(
+    is_deep_context: bool, timeout: int = None, command_only: bool = False
+) -> tuple[str, str]:
+    """
+    Get the system prompt split into its static instructions and volatile context.
+
+    The static part is identical across runs, so sending it as the system
+    message (and the context, which embeds CWD and date/time, at the start of
+    the first user message) lets providers reuse their cached prompt prefix.
+
+    Args:
+        is_deep_context: Whether we have deep context (tmux) or shallow (history).
+        timeout: Optional command timeout in seconds. If provided, adds timeout info to context.
+        command_only: Use the --command-only instructions instead of the base ones.
+
+    Returns:
+        Tuple of (static_instructions, context_section).
+
+    Raises:
+        FileNotFoundError: If the system prompt template file doesn't exist.
+    """
+    filename = "system_prompt_command_only.txt" if command_only else "system_prompt.txt"
+    static_prompt = _read_system_prompt_template(filename).rstrip()
+    context_prompt = "CONTEXT:\n" + _build_context_note(is_deep_context, timeout)
+    return static_prompt, context_prompt
 
 
 def get_base_system_prompt(is_deep_context: bool, timeout: int = None) -> str:
@@ -110,8 +144,7 @@ def get_base_system_prompt(is_deep_context: bool, timeout: int = None) -> str:
     Raises:
         FileNotFoundError: If the system prompt template file doesn't exist.
     """
-    context_note = _build_context_note(is_deep_context, timeout)
-    return _load_system_prompt_template("system_prompt.txt", context_note)
+    return "\n\n".join(get_system_prompt_parts(is_deep_context, timeout))
 
 
 def get_command_only_system_prompt(is_deep_context: bool, timeout: int = None) -> str:
@@ -122,5 +155,6 @@ def get_command_only_system_prompt(is_deep_context: bool, timeout: int = None) -
     behavior tailored to produce a single execute_shell tool call with no
     natural-language explanation.
     """
-    context_note = _build_context_note(is_deep_context, timeout)
-    return _load_system_prompt_template("system_prompt_command_only.txt", context_note)
+    return "\n\n".join(
+        get_system_prompt_parts(is_deep_context, timeout, command_only=True)
+    )
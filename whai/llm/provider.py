@@ -1,13 +1,17 @@
 """LLM provider wrapper using LiteLLM."""
 
 import asyncio
+import functools
 import json
+import logging
 import os
 import re
-from typing import Any, Dict, Generator, List, Optional, Union
+import threading
+import time
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
-from whai.configuration.user_config import WhaiConfig
-from whai.constants import GPT5_MODEL_PREFIX
+from whai.configuration.user_config import ProviderConfig, WhaiConfig
+from whai.constants import NO_TEMPERATURE_MODEL_PREFIXES
 from whai.llm.streaming import handle_complete_response, handle_streaming_response
 from whai.logging_setup import get_logger
 from whai.utils import PerformanceLogger
@@ -55,6 +59,231 @@ TASK_COMPLETE_TOOL = {
 }
 
 
+# API key-like tokens (e.g., sk-..., ,sk-...) redacted from error messages
+_API_KEY_RE = re.compile(r"[,]*\b[prsu]?k[-_][A-Za-z0-9]{8,}\b")
+
+# Message fragments used to classify provider errors that arrive without a
+# recognizable LiteLLM exception type (matched against lowercased text)
+_MODEL_MISSING_KEYWORDS = ("not found", "does not exist", "unknown")
+_NETWORK_ERROR_KEYWORDS = ("timeout", "temporarily unavailable", "connection")
+
+# Tools offered when the caller doesn't pass any; never mutated (MCP tools are
+# added to a new list)
+_DEFAULT_TOOLS = [EXECUTE_SHELL_TOOL, TASK_COMPLETE_TOOL]
+
+# LiteLLM module, imported lazily on first use to keep CLI startup fast
+_litellm = None
+
+# Background thread importing LiteLLM ahead of the first request, if started
+_litellm_preload: Optional[threading.Thread] = None
+
+
+def _preload_litellm() -> None:
+    """
+    Start importing LiteLLM on a background thread, once per process.
+
+    The import takes hundreds of milliseconds; starting it when the provider
+    is created overlaps it with context truncation, prompt building and MCP
+    startup instead of adding it to the first request.
+    """
+    global _litellm_preload
+    if _litellm is not None or _litellm_preload is not None:
+        return
+
+    def _run() -> None:
+        try:
+            _get_litellm()
+        except Exception:
+            # The first request imports again and reports the error itself
+            logger.debug("Background LiteLLM import failed", exc_info=True)
+
+    _litellm_preload = threading.Thread(
+        target=_run, name="whai-litellm-preload", daemon=True
+    )
+    _litellm_preload.start()
+
+
+def _get_litellm():
+    """Import LiteLLM once and return the module."""
+    global _litellm
+    if _litellm is None:
+        preload = _litellm_preload
+        if preload is not None and preload is not threading.current_thread():
+            # Let the background import finish rather than racing it
+            preload.join()
+            if _litellm is not None:
+                return _litellm
+        # Apply SSL cache optimization before importing litellm
+        # This significantly improves import performance
+        from whai.llm.ssl_cache import apply as apply_ssl_cache
+
+        apply_ssl_cache()
+
+        import litellm  # type: ignore
+
+        _litellm = litellm
+    return _litellm
+
+
+@functools.lru_cache(maxsize=1)
+def _litellm_exception_classes() -> tuple:
+    """
+    LiteLLM exception classes used to classify provider errors, imported once.
+
+    Returns empty tuples (which match nothing in isinstance) if the import
+    shape changes, so classification falls back to message matching.
+    """
+    try:
+        from litellm.exceptions import (
+            APIConnectionError,
+            AuthenticationError,
+            InvalidRequestError,
+            NotFoundError,
+            PermissionDeniedError,
+            RateLimitError,
+            ServiceUnavailableError,
+            Timeout,
+        )
+    except Exception:  # pragma: no cover - fallback if import shape changes
+        return ((),) * 8
+    return (
+        AuthenticationError,
+        RateLimitError,
+        ServiceUnavailableError,
+        APIConnectionError,
+        Timeout,
+        PermissionDeniedError,
+        NotFoundError,
+        InvalidRequestError,
+    )
+
+
+def _with_cache_breakpoint(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Mark the leading system message as a prompt-cache breakpoint.
+
+    Anthropic only caches prefixes explicitly tagged with cache_control, while
+    OpenAI-style providers cache identical prefixes automatically. The caller's
+    list is left untouched.
+    """
+    if (
+        not messages
+        or messages[0].get("role") != "system"
+        or not isinstance(messages[0].get("content"), str)
+    ):
+        return messages
+    first = dict(messages[0])
+    first["content"] = [
+        {
+            "type": "text",
+            "text": first["content"],
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    return [first, *messages[1:]]
+
+
+def _sanitize(secret: str) -> str:
+    """Redact API key-like tokens (e.g., sk-..., ,sk-...) from error text."""
+    return _API_KEY_RE.sub("<redacted>", str(secret))
+
+
+def _friendly_error_message(
+    exc: Exception, provider_name: str, model: Optional[str]
+) -> str:
+    """
+    Map a LiteLLM/provider error to a concise, actionable message.
+
+    Args:
+        exc: Exception raised by the completion call.
+        provider_name: Name of the configured provider.
+        model: Model the request was sent to.
+
+    Returns:
+        User-facing message with any API keys redacted.
+    """
+    name = type(exc).__name__
+    text = _sanitize(str(exc))
+    lowered = text.lower()
+    (
+        AuthenticationError,
+        RateLimitError,
+        ServiceUnavailableError,
+        APIConnectionError,
+        Timeout,
+        PermissionDeniedError,
+        NotFoundError,
+        InvalidRequestError,
+    ) = _litellm_exception_classes()
+
+    if isinstance(exc, AuthenticationError) or "AuthenticationError" in name:
+        return (
+            f"Authentication failed. Check your API key for provider '{provider_name}'. "
+            "Run 'whai --interactive-config' to update your configuration."
+        )
+    # Check for "LLM Provider NOT provided" error - this happens when model name format is wrong
+    if "provider not provided" in lowered:
+        return (
+            f"Model '{model}' is not recognized for provider '{provider_name}'. "
+            "The model name may be invalid or incorrectly formatted. "
+            "Choose a valid model with --model or run 'whai --interactive-config' to pick one."
+        )
+    if (
+        isinstance(exc, (NotFoundError, InvalidRequestError))
+        or "model" in lowered
+        and any(k in lowered for k in _MODEL_MISSING_KEYWORDS)
+    ):
+        return (
+            f"Model '{model}' is invalid or unavailable for provider '{provider_name}'. "
+            "Choose a valid model with --model or run 'whai --interactive-config' to pick one."
+        )
+    if isinstance(exc, PermissionDeniedError) or "permission" in lowered:
+        return (
+            f"Permission denied for model '{model}' with provider '{provider_name}'. "
+            "Verify access for your account or pick another model via 'whai --interactive-config'."
+        )
+    if isinstance(exc, RateLimitError) or "rate limit" in lowered:
+        return (
+            f"Rate limit reached for provider '{provider_name}'. "
+            "Try again later or switch model/provider."
+        )
+    if isinstance(exc, (APIConnectionError, ServiceUnavailableError, Timeout)) or any(
+        k in lowered for k in _NETWORK_ERROR_KEYWORDS
+    ):
+        return (
+            f"Network or service error connecting to provider '{provider_name}'. "
+            "Check your connection or try again."
+        )
+    # Default fallback
+    return f"LLM API error with provider '{provider_name}' and model '{model}': {text}"
+
+
+# Environment variables LiteLLM reads for each provider, and the config
+# attribute each one is set from. LM Studio uses its official lm_studio/ prefix
+_PROVIDER_ENV_VARS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "openai": (("OPENAI_API_KEY", "api_key"),),
+    "anthropic": (("ANTHROPIC_API_KEY", "api_key"),),
+    "gemini": (("GEMINI_API_KEY", "api_key"),),
+    "mistral": (("MISTRAL_API_KEY", "api_key"),),
+    "azure_openai": (
+        ("AZURE_API_KEY", "api_key"),
+        ("AZURE_API_BASE", "api_base"),
+        ("AZURE_API_VERSION", "api_version"),
+    ),
+    "ollama": (("OLLAMA_API_BASE", "api_base"),),
+    "lm_studio": (
+        ("LM_STUDIO_API_BASE", "api_base"),
+        ("LM_STUDIO_API_KEY", "api_key"),
+    ),
+}
+
+
+def _set_env(name: str, value: str) -> None:
+    """Set an environment variable, skipping the write if it already holds ``value``."""
+    if os.environ.get(name) != value:
+        os.environ[name] = value
+
+
 class LLMProvider:
     """
     Wrapper for LiteLLM to provide a consistent interface for LLM interactions.
@@ -115,15 +344,37 @@ class LLMProvider:
         # Store API key for providers that pass it directly (LM Studio, Ollama)
         self.api_key = provider_cfg.api_key if provider_cfg else None
 
-        # Only set temperature when explicitly provided; many models (e.g., gpt-5*)
+        # Only set temperature when explicitly provided; many models (e.g., gpt-5*, o3)
         # do not support it and should omit it entirely by default.
         self.temperature = temperature
+        # Resolved once; the model doesn't change for the provider's lifetime
+        self._supports_temperature = bool(self.model) and not self.model.startswith(
+            NO_TEMPERATURE_MODEL_PREFIXES
+        )
+
+        # Request settings that are the same for every call; send_message adds
+        # the per-call messages, stream flag and tools on top of a copy
+        self._base_completion_kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "drop_params": True,  # Automatically drop unsupported params for the model
+        }
+        # Add custom API base if configured (for LM Studio, Ollama, etc.)
+        if self.api_base:
+            self._base_completion_kwargs["api_base"] = self.api_base
+        # Add API key if configured (for LM Studio, Ollama - passed directly to completion)
+        if self.api_key and self.configured_provider in ("lm_studio", "ollama"):
+            self._base_completion_kwargs["api_key"] = self.api_key
+        # Only include temperature if explicitly set AND model supports it
+        if self.temperature is not None and self._supports_temperature:
+            self._base_completion_kwargs["temperature"] = self.temperature
 
         # MCP manager (set by executor when MCP is enabled)
         self._mcp_manager = None
 
-        # Set API keys for LiteLLM
-        self._configure_api_keys()
+        # Set API keys for LiteLLM, then start loading it while the caller
+        # finishes setting up the conversation
+        self._configure_api_keys(provider_cfg)
+        _preload_litellm()
         logger.debug(
             "LLMProvider initialized: provider=%s model=%s temp=%s api_base=%s api_key=%s",
             self.configured_provider,
@@ -134,60 +385,30 @@ class LLMProvider:
             extra={"category": "config"},
         )
 
-    def _configure_api_keys(self):
+    def _configure_api_keys(self, provider_cfg: Optional[ProviderConfig]) -> None:
         """
         Configure API keys and endpoints from config for LiteLLM.
 
         Only sets environment variables for the currently active provider to avoid
         conflicts and security issues. Each provider uses its specific environment
         variables as documented by LiteLLM.
+
+        Args:
+            provider_cfg: Configuration of the active provider, as resolved in __init__.
         """
         # Only set API keys for the provider we're actually using
         # This prevents conflicts when multiple providers are configured
+        if provider_cfg is None:
+            return
 
-        provider_cfg = self.config.llm.get_provider(self.configured_provider)
-
-        if self.configured_provider == "openai":
-            if provider_cfg and provider_cfg.api_key:
-                os.environ["OPENAI_API_KEY"] = provider_cfg.api_key
-
-        elif self.configured_provider == "anthropic":
-            if provider_cfg and provider_cfg.api_key:
-                os.environ["ANTHROPIC_API_KEY"] = provider_cfg.api_key
-
-        elif self.configured_provider == "gemini":
-            if provider_cfg and provider_cfg.api_key:
-                os.environ["GEMINI_API_KEY"] = provider_cfg.api_key
-
-        elif self.configured_provider == "mistral":
-            if provider_cfg and provider_cfg.api_key:
-                os.environ["MISTRAL_API_KEY"] = provider_cfg.api_key
-
-        elif self.configured_provider == "azure_openai":
-            if provider_cfg:
-                if provider_cfg.api_key:
-                    os.environ["AZURE_API_KEY"] = provider_cfg.api_key
-                if provider_cfg.api_base:
-                    os.environ["AZURE_API_BASE"] = provider_cfg.api_base
-                if provider_cfg.api_version:
-                    os.environ["AZURE_API_VERSION"] = provider_cfg.api_version
-
-        elif self.configured_provider == "ollama":
-            if provider_cfg and provider_cfg.api_base:
-                os.environ["OLLAMA_API_BASE"] = provider_cfg.api_base
-
-        elif self.configured_provider == "lm_studio":
-            # LM Studio uses lm_studio/ prefix with official LiteLLM support
-            # Set LM_STUDIO_API_BASE for the endpoint
-            if provider_cfg and provider_cfg.api_base:
-                os.environ["LM_STUDIO_API_BASE"] = provider_cfg.api_base
-
-            # Set LM_STUDIO_API_KEY if configured (defaults to empty string)
-            if provider_cfg and provider_cfg.api_key:
-                os.environ["LM_STUDIO_API_KEY"] = provider_cfg.api_key
-            else:
-                # LiteLLM defaults to empty string if not set
-                os.environ["LM_STUDIO_API_KEY"] = ""
+        for env_var, attr in _PROVIDER_ENV_VARS.get(self.configured_provider, ()):
+            value = getattr(provider_cfg, attr, None)
+            if value:
+                _set_env(env_var, value)
+
+        if self.configured_provider == "lm_studio" and not provider_cfg.api_key:
+            # LiteLLM defaults to empty string if not set
+            _set_env("LM_STUDIO_API_KEY", "")
 
     def send_message(
         self,
@@ -217,11 +438,13 @@ class LLMProvider:
         Yields:
             Dicts with 'type' key:
             - {'type': 'text', 'content': str} for text chunks
-            - {'type': 'tool_call', 'id': str, 'name': str, 'arguments': dict} for tool calls
+            - {'type': 'tool_call', 'id': str, 'name': str, 'arguments': dict,
+              'arguments_raw': str} for tool calls; 'arguments_raw' is the JSON
+              string exactly as received from the provider
         """
         # Default to using the execute_shell tool
         if tools is None:
-            tools = [EXECUTE_SHELL_TOOL, TASK_COMPLETE_TOOL]
+            tools = _DEFAULT_TOOLS
 
         # Add MCP tools if available
         mcp_tools = self._get_mcp_tools(mcp_loop=mcp_loop)
@@ -229,32 +452,20 @@ class LLMProvider:
             tools = tools + mcp_tools
 
         try:
-            # Only pass tools parameter if tools list is not empty
-            # Passing an empty tools list can confuse some APIs
             completion_kwargs = {
-                "model": self.model,
-                "messages": messages,
+                **self._base_completion_kwargs,
+                "messages": (
+                    _with_cache_breakpoint(messages)
+                    if self.configured_provider == "anthropic"
+                    else messages
+                ),
                 "stream": stream,
-                "drop_params": True,  # Automatically drop unsupported params for the model
             }
 
-            # Add custom API base if configured (for LM Studio, Ollama, etc.)
-            if self.api_base:
-                completion_kwargs["api_base"] = self.api_base
-
-            # Add API key if configured (for LM Studio, Ollama - passed directly to completion)
-            if self.api_key and self.configured_provider in ("lm_studio", "ollama"):
-                completion_kwargs["api_key"] = self.api_key
-
-            # Only include temperature if explicitly set AND model supports it
-            if (
-                self.temperature is not None
-                and self.model
-                and not self.model.startswith(GPT5_MODEL_PREFIX)
-            ):
-                completion_kwargs["temperature"] = self.temperature
-
-            if tools:  # Only add tools if list is not empty
+            # Only pass tools parameter if tools list is not empty
+            # Passing an empty tools list can confuse some APIs
+            tool_count = len(tools)
+            if tool_count:
                 completion_kwargs["tools"] = tools
 
             # Pass through tool_choice only when provided to avoid confusing providers
@@ -264,87 +475,37 @@ class LLMProvider:
             logger.info(
                 "Sending message to LLM: stream=%s tools_enabled=%s tool_count=%d temp=%s",
                 stream,
-                bool(tools),
-                len(tools) if tools else 0,
+                tool_count > 0,
+                tool_count,
                 self.temperature if self.temperature is not None else "default",
                 extra={"category": "api"},
             )
-            # Log the exact payload the model will see for debug purposes
-            try:
-                pretty_payload = json.dumps(
-                    {
-                        "model": self.model,
-                        "messages": messages,
-                        "tools": tools or [],
-                        "tool_choice": tool_choice,
-                        **(
-                            {"temperature": self.temperature}
-                            if self.temperature is not None
-                            else {}
-                        ),
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                )
-                logger.debug("LLM request payload:\n%s", pretty_payload)
-                # Also log human-readable prompts (system/user) with natural line breaks
-                try:
-                    for m in messages:
-                        role = m.get("role")
-                        if role in ("system", "user"):
-                            heading = (
-                                "LLM system prompt"
-                                if role == "system"
-                                else "LLM user message"
-                            )
-                            content = m.get("content", "")
-                            logger.debug(
-                                "%s:\n%s",
-                                heading,
-                                content,
-                                extra={
-                                    "category": "llm_system"
-                                    if role == "system"
-                                    else "llm_user"
-                                },
-                            )
-                except Exception:
-                    # Never fail on diagnostic logging
-                    pass
-            except Exception:
-                # Payload logging must never break execution
-                logger.debug("LLM request payload: <unserializable>")
-            if tools:
-                logger.debug(
-                    "Tool definitions: %s",
-                    [t.get("function", {}).get("name") for t in tools],
-                    extra={"category": "api"},
-                )
-            # Lazy import to keep CLI startup fast
-            import time as _t
-
-            # Measure import time for LiteLLM for diagnostics
-            t_import_start = _t.perf_counter()
-
-            # Apply SSL cache optimization before importing litellm
-            # This significantly improves import performance
-            from whai.llm.ssl_cache import apply as apply_ssl_cache
-
-            apply_ssl_cache()
-
-            from litellm import completion  # type: ignore
-
-            # Update last_section_time to track import duration, then log using perf logger
-            self.perf_logger.last_section_time = t_import_start
-            self.perf_logger.log_section("LiteLLM import")
-
-            t_start = _t.perf_counter()
+            # Serializing the whole conversation is only worth it when debug
+            # records will actually be emitted
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_request_payload(completion_kwargs)
+            if _litellm is None:
+                # Measure time spent waiting on the LiteLLM import for diagnostics
+                # (first call only; the preload thread may have a head start)
+                t_import_start = time.perf_counter()
+                litellm = _get_litellm()
+                # Update last_section_time to track import duration, then log using perf logger
+                self.perf_logger.last_section_time = t_import_start
+                self.perf_logger.log_section("LiteLLM import")
+            else:
+                litellm = _litellm
+
+            t_start = time.perf_counter()
             logger.info("LLM API call started")
 
-            response = completion(**completion_kwargs)
+            # Resolve completion at call time so litellm.completion stays patchable
+            response = litellm.completion(**completion_kwargs)
 
             if stream:
                 underlying = handle_streaming_response(response)
+                # Per-chunk timing and counters only feed perf log records
+                if not self.perf_logger.is_enabled():
+                    return underlying
 
                 def _perf_wrapped_stream():
                     first = True
@@ -357,10 +518,12 @@ class LLMProvider:
                                 # Update last_section_time to track time to first chunk, then log using perf logger
                                 self.perf_logger.last_section_time = t_start
                                 self.perf_logger.log_section("LLM API first chunk")
-                            if chunk.get("type") == "text":
-                                text = chunk.get("content") or ""
-                                text_len += len(text)
-                            elif chunk.get("type") == "tool_call":
+                            # handle_streaming_response always sets "type", and
+                            # text chunks always carry non-empty "content"
+                            chunk_type = chunk["type"]
+                            if chunk_type == "text":
+                                text_len += len(chunk["content"])
+                            elif chunk_type == "tool_call":
                                 tool_calls += 1
                             yield chunk
                     finally:
@@ -380,98 +543,65 @@ class LLMProvider:
 
         except Exception as e:
             # Map LiteLLM/provider errors to concise, actionable messages.
-            def _sanitize(secret: str) -> str:
-                try:
-                    # Redact API key-like tokens (e.g., sk-..., ,sk-...)
-                    return re.sub(
-                        r"[,]*\b[prsu]?k[-_][A-Za-z0-9]{8,}\b",
-                        "<redacted>",
-                        str(secret),
-                    )
-                except Exception:
-                    return str(secret)
-
-            def _friendly_message(exc: Exception) -> str:
-                name = type(exc).__name__
-                text = _sanitize(str(exc))
-                # Import lazily to avoid hard dependency at import-time
-                try:
-                    from litellm.exceptions import (
-                        APIConnectionError,
-                        AuthenticationError,
-                        InvalidRequestError,
-                        NotFoundError,
-                        PermissionDeniedError,
-                        RateLimitError,
-                        ServiceUnavailableError,
-                        Timeout,
-                    )
-                except Exception:  # pragma: no cover - fallback if import shape changes
-                    AuthenticationError = RateLimitError = ServiceUnavailableError = (
-                        APIConnectionError
-                    ) = Timeout = PermissionDeniedError = NotFoundError = (
-                        InvalidRequestError
-                    ) = tuple()  # type: ignore
-
-                if (
-                    isinstance(exc, AuthenticationError)
-                    or "AuthenticationError" in name
-                ):
-                    return (
-                        f"Authentication failed. Check your API key for provider '{self.configured_provider}'. "
-                        "Run 'whai --interactive-config' to update your configuration."
-                    )
-                # Check for "LLM Provider NOT provided" error - this happens when model name format is wrong
-                if (
-                    "llm provider not provided" in text.lower()
-                    or "provider not provided" in text.lower()
-                ):
-                    return (
-                        f"Model '{self.model}' is not recognized for provider '{self.configured_provider}'. "
-                        "The model name may be invalid or incorrectly formatted. "
-                        "Choose a valid model with --model or run 'whai --interactive-config' to pick one."
-                    )
-                if (
-                    isinstance(exc, (NotFoundError, InvalidRequestError))
-                    or "model" in text.lower()
-                    and (
-                        "not found" in text.lower()
-                        or "does not exist" in text.lower()
-                        or "unknown" in text.lower()
-                    )
-                ):
-                    return (
-                        f"Model '{self.model}' is invalid or unavailable for provider '{self.configured_provider}'. "
-                        "Choose a valid model with --model or run 'whai --interactive-config' to pick one."
-                    )
-                if (
-                    isinstance(exc, PermissionDeniedError)
-                    or "permission" in text.lower()
-                ):
-                    return (
-                        f"Permission denied for model '{self.model}' with provider '{self.configured_provider}'. "
-                        "Verify access for your account or pick another model via 'whai --interactive-config'."
-                    )
-                if isinstance(exc, RateLimitError) or "rate limit" in text.lower():
-                    return (
-                        f"Rate limit reached for provider '{self.configured_provider}'. "
-                        "Try again later or switch model/provider."
-                    )
-                if isinstance(
-                    exc, (APIConnectionError, ServiceUnavailableError, Timeout)
-                ) or any(
-                    k in text.lower()
-                    for k in ["timeout", "temporarily unavailable", "connection"]
-                ):
-                    return (
-                        f"Network or service error connecting to provider '{self.configured_provider}'. "
-                        "Check your connection or try again."
-                    )
-                # Default fallback
-                return f"LLM API error with provider '{self.configured_provider}' and model '{self.model}': {_sanitize(text)}"
+            raise RuntimeError(
+                _friendly_error_message(e, self.configured_provider, self.model)
+            )
 
-            friendly = _friendly_message(e)
-            raise RuntimeError(friendly)
+    def _log_request_payload(self, completion_kwargs: Dict[str, Any]) -> None:
+        """Log the exact payload the model will see, for debug purposes."""
+        messages = completion_kwargs["messages"]
+        tools = completion_kwargs.get("tools")
+        try:
+            # Reuse the request kwargs rather than building a parallel payload
+            pretty_payload = json.dumps(
+                {
+                    key: completion_kwargs[key]
+                    for key in (
+                        "model",
+                        "messages",
+                        "tools",
+                        "tool_choice",
+                        "temperature",
+                    )
+                    if key in completion_kwargs
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+            logger.debug("LLM request payload:\n%s", pretty_payload)
+            # Also log human-readable prompts (system/user) with natural line breaks
+            try:
+                for m in messages:
+                    role = m.get("role")
+                    if role in ("system", "user"):
+                        heading = (
+                            "LLM system prompt"
+                            if role == "system"
+                            else "LLM user message"
+                        )
+                        content = m.get("content", "")
+                        logger.debug(
+                            "%s:\n%s",
+                            heading,
+                            content,
+                            extra={
+                                "category": "llm_system"
+                                if role == "system"
+                                else "llm_user"
+                            },
+                        )
+            except (AttributeError, TypeError):
+                # Never fail on diagnostic logging (malformed message entries)
+                pass
+        except (TypeError, ValueError):
+            # Payload logging must never break execution (non-JSON or circular values)
+            logger.debug("LLM request payload: <unserializable>")
+        if tools:
+            logger.debug(
+                "Tool definitions: %s",
+                [t.get("function", {}).get("name") for t in tools],
+                extra={"category": "api"},
+            )
 
     def _get_mcp_tools(
         self, mcp_loop: Optional[asyncio.AbstractEventLoop] = None
@@ -1,17 +1,66 @@
 """Streaming response handling for LLM providers."""
 
 import json
-from typing import Any, Dict, Generator, Optional
+import re
+import time
+from typing import Any, Dict, Generator, List, Optional
 
+from whai.constants import DEFAULT_STREAM_BATCH_CHARS, DEFAULT_STREAM_FLUSH_MS
 from whai.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Characters that affect object nesting while scanning streamed JSON
+_JSON_STRUCTURE = re.compile(r'[{}"\\]')
+
+
+def _advance_json_scan(state: Dict[str, Any], chunk: str) -> None:
+    """
+    Update the brace depth of a streamed JSON object with a new chunk.
+
+    Only the new chunk is scanned, so tracking a long argument string stays
+    linear instead of re-parsing everything received so far on every delta.
+    Braces inside strings and escaped quotes are ignored; an escape split
+    across chunks is carried over in ``state["escaped"]``.
+    """
+    depth = state["depth"]
+    in_string = state["in_string"]
+    # Index up to which characters are consumed by a pending backslash escape
+    skip_until = 1 if state["escaped"] else 0
+    escaped = False
+    for match in _JSON_STRUCTURE.finditer(chunk):
+        i = match.start()
+        if i < skip_until:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                skip_until = i + 2
+                escaped = i + 1 == len(chunk)
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+            state["opened"] = True
+        elif char == "}":
+            depth -= 1
+    state["depth"] = depth
+    state["in_string"] = in_string
+    state["escaped"] = escaped
+
 
 def handle_streaming_response(response) -> Generator[Dict[str, Any], None, None]:
     """
     Handle streaming response from LiteLLM.
 
+    Text deltas that arrive within DEFAULT_STREAM_FLUSH_MS of the previous
+    flush are coalesced (up to DEFAULT_STREAM_BATCH_CHARS) so consumers render
+    fewer, larger chunks. The first delta is never delayed, and buffered text
+    is flushed as soon as a tool call starts streaming and when the stream
+    ends or fails.
+
     Args:
         response: Streaming response from litellm.completion
 
@@ -19,93 +68,139 @@ def handle_streaming_response(response) -> Generator[Dict[str, Any], None, None]
         Parsed response chunks.
     """
     # Buffer partial tool call data across chunks by id
-    # Stores: {call_id: {"name": str, "args": str}}
-    partial_tool_calls: Dict[str, Dict[str, str]] = {}
+    # Stores: {call_id: {"name": str, "args_chunks": list[str], plus JSON scan state}}
+    partial_tool_calls: Dict[str, Dict[str, Any]] = {}
     # Track the last known call_id to handle None ids in subsequent chunks
     last_call_id: Optional[str] = None
-
-    for chunk in response:
-        delta = chunk.choices[0].delta
-
-        # Check for text content
-        if hasattr(delta, "content") and delta.content:
-            yield {"type": "text", "content": delta.content}
-
-        # Check for tool calls
-        if hasattr(delta, "tool_calls") and delta.tool_calls:
-            for tool_call in delta.tool_calls:
-                if not hasattr(tool_call, "function"):
-                    continue
-
-                raw_call_id = getattr(tool_call, "id", "unknown")
-                name = tool_call.function.name
-                arg_chunk = tool_call.function.arguments or ""
-
-                # Handle None ids by using the last known call_id
-                # OpenAI sends id and name in first chunk, then None for both in subsequent chunks
-                if raw_call_id is not None:
-                    call_id = raw_call_id
-                    last_call_id = call_id
-                elif last_call_id is not None:
-                    call_id = last_call_id
-                else:
-                    # No known call_id yet, skip this chunk
-                    logger.warning(
-                        "Received tool_call chunk with no id and no previous id"
-                    )
-                    continue
-
-                # Initialize buffer for this call_id if needed
-                if call_id not in partial_tool_calls:
-                    partial_tool_calls[call_id] = {"name": None, "args": ""}
-                    logger.debug(
-                        "Initialized buffer for tool call id=%s",
-                        call_id,
-                        extra={"category": "api"},
-                    )
-
-                # Store name if present (usually only in first chunk)
-                if name:
-                    partial_tool_calls[call_id]["name"] = name
-                    logger.debug(
-                        "Stored tool name=%s for id=%s",
-                        name,
-                        call_id,
-                        extra={"category": "api"},
-                    )
-
-                # Accumulate arguments
-                if arg_chunk:
-                    partial_tool_calls[call_id]["args"] += arg_chunk
-
-                # Try to parse when we have arguments
-                raw_args = partial_tool_calls[call_id]["args"]
-                if not raw_args:
-                    continue
-
-                try:
-                    parsed = json.loads(raw_args)
-                except json.JSONDecodeError:
-                    # Still incomplete, wait for more chunks
-                    continue
-
-                # Only emit once we have valid parsed arguments and a name
-                stored_name = partial_tool_calls[call_id]["name"]
-                if isinstance(parsed, dict) and stored_name:
-                    yield {
-                        "type": "tool_call",
-                        "id": call_id,
-                        "name": stored_name,
-                        "arguments": parsed,
-                    }
-                    logger.debug(
-                        "Emitted tool_call from stream: name=%s id=%s",
-                        stored_name,
-                        call_id,
-                        extra={"category": "api"},
-                    )
-                    # Prevent duplicate emits for same id
-                    partial_tool_calls.pop(call_id, None)
+    # Pending text not yet yielded, and when text was last flushed
+    text_buf: List[str] = []
+    buf_len = 0
+    flush_interval = DEFAULT_STREAM_FLUSH_MS / 1000
+    last_flush = float("-inf")
+
+    # Set when the consumer closes the stream; yielding again would be an error
+    closed = False
+    try:
+        for chunk in response:
+            # Some providers send keepalive or usage-only frames with no choices
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+
+            # Check for text content (one attribute lookup per field per delta)
+            content = getattr(delta, "content", None)
+            if content:
+                text_buf.append(content)
+                buf_len += len(content)
+                now = time.perf_counter()
+                if buf_len >= DEFAULT_STREAM_BATCH_CHARS or now - last_flush >= flush_interval:
+                    yield {"type": "text", "content": "".join(text_buf)}
+                    text_buf.clear()
+                    buf_len = 0
+                    last_flush = now
+
+            # Check for tool calls
+            delta_tool_calls = getattr(delta, "tool_calls", None)
+            if delta_tool_calls:
+                # Show the text leading up to a tool call before its arguments stream
+                if text_buf:
+                    yield {"type": "text", "content": "".join(text_buf)}
+                    text_buf.clear()
+                    buf_len = 0
+                    last_flush = time.perf_counter()
+                for tool_call in delta_tool_calls:
+                    function = getattr(tool_call, "function", None)
+                    if function is None:
+                        continue
+
+                    raw_call_id = getattr(tool_call, "id", "unknown")
+                    name = function.name
+                    arg_chunk = function.arguments or ""
+
+                    # Handle None ids by using the last known call_id
+                    # OpenAI sends id and name in first chunk, then None for both in subsequent chunks
+                    if raw_call_id is not None:
+                        call_id = raw_call_id
+                        last_call_id = call_id
+                    elif last_call_id is not None:
+                        call_id = last_call_id
+                    else:
+                        # No known call_id yet, skip this chunk
+                        logger.warning(
+                            "Received tool_call chunk with no id and no previous id"
+                        )
+                        continue
+
+                    # Initialize buffer for this call_id if needed
+                    if call_id not in partial_tool_calls:
+                        partial_tool_calls[call_id] = {
+                            "name": None,
+                            "args_chunks": [],
+                            "depth": 0,
+                            "in_string": False,
+                            "escaped": False,
+                            "opened": False,
+                        }
+                        logger.debug(
+                            "Initialized buffer for tool call id=%s",
+                            call_id,
+                            extra={"category": "api"},
+                        )
+
+                    # Store name if present (usually only in first chunk)
+                    if name:
+                        partial_tool_calls[call_id]["name"] = name
+                        logger.debug(
+                            "Stored tool name=%s for id=%s",
+                            name,
+                            call_id,
+                            extra={"category": "api"},
+                        )
+
+                    # Accumulate arguments
+                    partial = partial_tool_calls[call_id]
+                    if arg_chunk:
+                        # Collect chunks and join once, instead of repeated string concat
+                        partial["args_chunks"].append(arg_chunk)
+                        _advance_json_scan(partial, arg_chunk)
+
+                    # Only parse once the top-level object has closed
+                    if not partial["opened"] or partial["depth"] != 0:
+                        continue
+                    raw_args = "".join(partial["args_chunks"])
+
+                    try:
+                        parsed = json.loads(raw_args)
+                    except json.JSONDecodeError:
+                        # Still incomplete, wait for more chunks
+                        continue
+
+                    # Only emit once we have valid parsed arguments and a name
+                    stored_name = partial_tool_calls[call_id]["name"]
+                    if isinstance(parsed, dict) and stored_name:
+                        yield {
+                            "type": "tool_call",
+                            "id": call_id,
+                            "name": stored_name,
+                            "arguments": parsed,
+                            "arguments_raw": raw_args,
+                        }
+                        logger.debug(
+                            "Emitted tool_call from stream: name=%s id=%s",
+                            stored_name,
+                            call_id,
+                            extra={"category": "api"},
+                        )
+                        # Prevent duplicate emits for same id
+                        partial_tool_calls.pop(call_id, None)
+    except GeneratorExit:
+        closed = True
+        raise
+    finally:
+        # Deliver buffered text even if the stream fails partway through
+        if text_buf and not closed:
+            yield {"type": "text", "content": "".join(text_buf)}
 
 
 def handle_complete_response(response) -> Dict[str, Any]:
@@ -146,6 +241,7 @@ def handle_complete_response(response) -> Dict[str, Any]:
                     "id": tool_call.id,
                     "name": tool_call.function.name,
                     "arguments": parsed_args,
+                    "arguments_raw": raw_args,
                 }
             )
 
@@ -38,6 +38,10 @@ def truncate_text_with_tokens(text: str, max_tokens: int) -> Tuple[str, bool]:
     if not text:
         return text, False
 
+    # Fast path: text this short cannot exceed the limit, skip estimation entirely
+    if len(text) < (max_tokens + 1) * CHARS_PER_TOKEN:
+        return text, False
+
     try:
         # Estimate token count using simple character ratio
         token_count = _estimate_tokens(text)
@@ -1,5 +1,6 @@
 """Shared utility functions for whai."""
 
+import functools
 import os
 import sys
 from typing import Literal
@@ -12,10 +13,15 @@ ShellType = Literal["bash", "zsh", "fish", "pwsh", "powershell", "cmd"]
 SUPPORTED_SHELLS = ["bash", "zsh", "fish", "pwsh", "powershell", "cmd"]
 
 
+@functools.lru_cache(maxsize=1)
 def detect_shell() -> ShellType:
     """
     Detect the current shell type.
 
+    The result is cached for the lifetime of the process since the shell
+    does not change mid-session; call ``detect_shell.cache_clear()`` to
+    force re-detection.
+
     Returns:
         One of: "bash", "zsh", "fish", "pwsh", "powershell", or "cmd"
         
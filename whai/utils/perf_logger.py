@@ -82,6 +82,18 @@ class PerformanceLogger:
         self.last_section_time = self.start_time
         self.section_count = 0
     
+    def is_enabled(self, level: str = "info") -> bool:
+        """
+        Check whether sections logged at this level would be emitted.
+        
+        Args:
+            level: Log level ("info", "debug", etc.)
+            
+        Returns:
+            True if log_section/log_complete at this level produce output.
+        """
+        return logger.isEnabledFor(_get_log_level(level))
+    
     def log_section(
         self,
         section_name: str,